@@ -25,7 +25,8 @@ config.set_main_option("sqlalchemy.url", SYNC_DATABASE_URL)
 
 # Logging
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    # Keep the app's module loggers alive when migrations run in-process (MIGRATION_MODE=sync|async)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # Import models after sys.path fix
 from app.db.base import Base
@@ -9,6 +9,8 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+
+from app.db.migration_utils import set_safe_timeouts
 ${imports if imports else ""}
 
 # revision identifiers, used by Alembic.
@@ -20,9 +22,11 @@ depends_on: Union[str, Sequence[str], None] = ${repr(depends_on)}
 
 def upgrade() -> None:
     """Upgrade schema."""
+    set_safe_timeouts()
     ${upgrades if upgrades else "pass"}
 
 
 def downgrade() -> None:
     """Downgrade schema."""
+    set_safe_timeouts()
     ${downgrades if downgrades else "pass"}
@@ -0,0 +1,38 @@
+"""water goals latest index
+
+Revision ID: 1b274afab29a
+Revises: c4cd7a278768
+Create Date: 2026-10-15 14:40:52.217306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import set_safe_timeouts
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b274afab29a'
+down_revision: Union[str, Sequence[str], None] = 'c4cd7a278768'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    set_safe_timeouts()
+    # CONCURRENTLY can't run inside a transaction, and avoids blocking writes while building
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_water_goals_user_created_at', 'water_goals', ['user_id', sa.text('created_at DESC')],
+            unique=False, postgresql_include=['goal_ml'], postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    set_safe_timeouts()
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_water_goals_user_created_at', table_name='water_goals', postgresql_concurrently=True)
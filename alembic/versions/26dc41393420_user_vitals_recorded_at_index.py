@@ -0,0 +1,38 @@
+"""user vitals recorded_at index
+
+Revision ID: 26dc41393420
+Revises: 772af1b48113
+Create Date: 2026-10-15 13:51:08.660271
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import set_safe_timeouts
+
+
+# revision identifiers, used by Alembic.
+revision: str = '26dc41393420'
+down_revision: Union[str, Sequence[str], None] = '772af1b48113'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    set_safe_timeouts()
+    # CONCURRENTLY can't run inside a transaction, and avoids blocking writes while building
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_vitals_user_recorded_at', 'user_vitals', ['user_id', sa.text('recorded_at DESC')],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    set_safe_timeouts()
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_vitals_user_recorded_at', table_name='user_vitals', postgresql_concurrently=True)
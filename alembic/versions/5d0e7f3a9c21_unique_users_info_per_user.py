@@ -0,0 +1,61 @@
+"""unique users_info per user
+
+Revision ID: 5d0e7f3a9c21
+Revises: 1b274afab29a
+Create Date: 2026-10-15 16:02:11.418275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.migration_utils import set_safe_timeouts
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0e7f3a9c21'
+down_revision: Union[str, Sequence[str], None] = '1b274afab29a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TMP_INDEX = 'ix_users_info_user_id_new'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    set_safe_timeouts()
+    # users_info has no write timestamp and its ids are random uuid4, so write order can't be recovered;
+    # keep the active, most filled-in profile per user instead (id only makes the pick deterministic)
+    op.execute("""
+        DELETE FROM users_info a USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY user_id
+                ORDER BY is_active DESC NULLS LAST,
+                         num_nonnulls(first_name, last_name, blood_group, age, height, weight,
+                                      city, country, pincode) DESC,
+                         id
+            ) AS rn
+            FROM users_info
+        ) ranked
+        WHERE a.id = ranked.id AND ranked.rn > 1
+    """)
+    # Same column, now unique so it can arbitrate ON CONFLICT. Built under a temporary name and swapped in
+    # afterwards, so user_id is indexed (and, once built, unique) at every point.
+    # CONCURRENTLY can't run inside a transaction, and avoids blocking writes while building
+    with op.get_context().autocommit_block():
+        _swap_user_id_index(unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    set_safe_timeouts()
+    with op.get_context().autocommit_block():
+        _swap_user_id_index(unique=False)
+
+
+def _swap_user_id_index(unique: bool) -> None:
+    # A failed concurrent build leaves an INVALID index behind; clear it so a rerun can start over
+    op.drop_index(_TMP_INDEX, table_name='users_info', if_exists=True, postgresql_concurrently=True)
+    op.create_index(_TMP_INDEX, 'users_info', ['user_id'], unique=unique, postgresql_concurrently=True)
+    op.drop_index(op.f('ix_users_info_user_id'), table_name='users_info', postgresql_concurrently=True)
+    op.execute(f"ALTER INDEX {_TMP_INDEX} RENAME TO ix_users_info_user_id")
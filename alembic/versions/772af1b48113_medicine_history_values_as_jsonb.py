@@ -0,0 +1,52 @@
+"""medicine history values as jsonb
+
+Revision ID: 772af1b48113
+Revises: 91b9c4660690
+Create Date: 2026-10-15 13:24:40.106953
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.db.migration_utils import set_safe_timeouts
+
+
+# revision identifiers, used by Alembic.
+revision: str = '772af1b48113'
+down_revision: Union[str, Sequence[str], None] = '91b9c4660690'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    set_safe_timeouts()
+    # Schedule changes were already stored as JSON text; plain field values become JSON strings
+    for column in ('old_value', 'new_value'):
+        op.alter_column(
+            'medicine_history', column,
+            existing_type=sa.Text(),
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using=(
+                f"CASE WHEN change_type = 'schedules_changed' THEN {column}::jsonb ELSE to_jsonb({column}) END"
+            ),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    set_safe_timeouts()
+    for column in ('old_value', 'new_value'):
+        op.alter_column(
+            'medicine_history', column,
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            type_=sa.Text(),
+            existing_nullable=True,
+            postgresql_using=(
+                f"CASE WHEN jsonb_typeof({column}) = 'string' THEN {column} #>> '{{}}' ELSE {column}::text END"
+            ),
+        )
@@ -0,0 +1,39 @@
+"""index for user lookups
+
+Revision ID: 864ce2b556cf
+Revises: e406588611c7
+Create Date: 2026-10-15 12:06:52.402187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.migration_utils import set_safe_timeouts
+
+
+# revision identifiers, used by Alembic.
+revision: str = '864ce2b556cf'
+down_revision: Union[str, Sequence[str], None] = 'e406588611c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    set_safe_timeouts()
+    # CONCURRENTLY can't run inside a transaction, and avoids blocking writes while building
+    with op.get_context().autocommit_block():
+        # ix_users_id only duplicated the primary key index
+        op.drop_index(op.f('ix_users_id'), table_name='users', postgresql_concurrently=True)
+        op.create_index(
+            op.f('ix_users_info_user_id'), 'users_info', ['user_id'], unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    set_safe_timeouts()
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_users_info_user_id'), table_name='users_info', postgresql_concurrently=True)
+        op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False, postgresql_concurrently=True)
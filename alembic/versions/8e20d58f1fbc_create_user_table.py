@@ -10,6 +10,8 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 
+from app.db.migration_utils import set_safe_timeouts
+
 
 # revision identifiers, used by Alembic.
 revision: str = '8e20d58f1fbc'
@@ -20,6 +22,7 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
+    set_safe_timeouts()
     # ### commands auto generated by Alembic - please adjust! ###
     op.create_table('users',
     sa.Column('id', sa.UUID(), nullable=False),
@@ -52,6 +55,7 @@ def upgrade() -> None:
 
 def downgrade() -> None:
     """Downgrade schema."""
+    set_safe_timeouts()
     # ### commands auto generated by Alembic - please adjust! ###
     op.drop_index(op.f('ix_users_info_id'), table_name='users_info')
     op.drop_table('users_info')
@@ -0,0 +1,53 @@
+"""medicine lookup indexes
+
+Revision ID: 91b9c4660690
+Revises: 864ce2b556cf
+Create Date: 2026-10-15 13:02:17.518440
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import set_safe_timeouts
+
+
+# revision identifiers, used by Alembic.
+revision: str = '91b9c4660690'
+down_revision: Union[str, Sequence[str], None] = '864ce2b556cf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    set_safe_timeouts()
+    # CONCURRENTLY can't run inside a transaction, and avoids blocking writes while building
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_medicines_user_id'), 'medicines', ['user_id'], unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_medicine_schedules_medicine_id_cov', 'medicine_schedules', ['medicine_id'], unique=False,
+            postgresql_include=['id', 'user_id', 'time_of_day', 'dose_label', 'dosage'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_medicine_intake_history_user_medicine_taken', 'medicine_intake_history',
+            ['user_id', 'medicine_id', sa.text('taken_at DESC')], unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    set_safe_timeouts()
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_medicine_intake_history_user_medicine_taken', table_name='medicine_intake_history',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_medicine_schedules_medicine_id_cov', table_name='medicine_schedules', postgresql_concurrently=True
+        )
+        op.drop_index(op.f('ix_medicines_user_id'), table_name='medicines', postgresql_concurrently=True)
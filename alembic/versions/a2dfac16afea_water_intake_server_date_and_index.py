@@ -0,0 +1,41 @@
+"""water intake server date and index
+
+Revision ID: a2dfac16afea
+Revises: 37b20a000e66
+Create Date: 2026-10-15 10:12:41.530918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import set_safe_timeouts
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2dfac16afea'
+down_revision: Union[str, Sequence[str], None] = '37b20a000e66'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    set_safe_timeouts()
+    op.execute("UPDATE water_intake SET date = CURRENT_DATE WHERE date IS NULL")
+    op.alter_column('water_intake', 'date',
+               existing_type=sa.Date(),
+               nullable=False,
+               server_default=sa.text('CURRENT_DATE'))
+    op.create_index('ix_water_intake_user_date_sum', 'water_intake', ['user_id', 'date', 'intake_ml'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    set_safe_timeouts()
+    op.drop_index('ix_water_intake_user_date_sum', table_name='water_intake')
+    op.alter_column('water_intake', 'date',
+               existing_type=sa.Date(),
+               nullable=True,
+               server_default=None)
@@ -10,6 +10,8 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 
+from app.db.migration_utils import set_safe_timeouts
+
 
 # revision identifiers, used by Alembic.
 revision: str = 'b6a800fc93fc'
@@ -20,6 +22,7 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
+    set_safe_timeouts()
     # ### commands auto generated by Alembic - please adjust! ###
     op.create_table('user_vitals',
     sa.Column('id', sa.UUID(), nullable=False),
@@ -39,6 +42,7 @@ def upgrade() -> None:
 
 def downgrade() -> None:
     """Downgrade schema."""
+    set_safe_timeouts()
     # ### commands auto generated by Alembic - please adjust! ###
     op.drop_table('user_vitals')
     # ### end Alembic commands ###
@@ -0,0 +1,61 @@
+"""unique water intake per day
+
+Revision ID: c4cd7a278768
+Revises: 26dc41393420
+Create Date: 2026-10-15 14:12:33.804129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.db.migration_utils import set_safe_timeouts
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4cd7a278768'
+down_revision: Union[str, Sequence[str], None] = '26dc41393420'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    set_safe_timeouts()
+    # Fold duplicate rows left by concurrent logs into one row per user/day
+    op.execute("""
+        UPDATE water_intake w SET intake_ml = t.total
+        FROM (
+            SELECT user_id, date, sum(intake_ml) AS total
+            FROM water_intake GROUP BY user_id, date HAVING count(*) > 1
+        ) t
+        WHERE w.user_id = t.user_id AND w.date = t.date
+    """)
+    op.execute("""
+        DELETE FROM water_intake a USING water_intake b
+        WHERE a.user_id = b.user_id AND a.date = b.date AND a.ctid > b.ctid
+    """)
+    # Same covering columns as before, now unique so it can arbitrate ON CONFLICT.
+    # CONCURRENTLY can't run inside a transaction, and avoids blocking writes while building; the old index
+    # is only dropped once the new one is valid, so per-day lookups stay indexed throughout
+    with op.get_context().autocommit_block():
+        # A failed concurrent build leaves an INVALID index behind; clear it so a rerun can start over
+        op.drop_index(
+            'uq_water_intake_user_date', table_name='water_intake', if_exists=True, postgresql_concurrently=True
+        )
+        op.create_index(
+            'uq_water_intake_user_date', 'water_intake', ['user_id', 'date'], unique=True,
+            postgresql_include=['intake_ml'], postgresql_concurrently=True,
+        )
+        op.drop_index('ix_water_intake_user_date_sum', table_name='water_intake', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    set_safe_timeouts()
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_water_intake_user_date_sum', 'water_intake', ['user_id', 'date', 'intake_ml'], unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index('uq_water_intake_user_date', table_name='water_intake', postgresql_concurrently=True)
@@ -0,0 +1,45 @@
+"""server side timestamp defaults
+
+Revision ID: e406588611c7
+Revises: f448326c7702
+Create Date: 2026-10-15 11:41:09.775312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import set_safe_timeouts
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e406588611c7'
+down_revision: Union[str, Sequence[str], None] = 'f448326c7702'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UTC_NOW = sa.text("timezone('utc', now())")
+
+TIMESTAMP_COLUMNS = [
+    ('medicine_history', 'changed_at'),
+    ('medicine_intake_history', 'taken_at'),
+    ('medicine_intake_history', 'recorded_at'),
+    ('user_vitals', 'recorded_at'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    set_safe_timeouts()
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, existing_type=sa.DateTime(), server_default=UTC_NOW)
+    op.alter_column('water_goals', 'created_at', existing_type=sa.Date(), server_default=sa.text('CURRENT_DATE'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    set_safe_timeouts()
+    op.alter_column('water_goals', 'created_at', existing_type=sa.Date(), server_default=None)
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column, existing_type=sa.DateTime(), server_default=None)
@@ -0,0 +1,42 @@
+"""store intake status as smallint
+
+Revision ID: f448326c7702
+Revises: a2dfac16afea
+Create Date: 2026-10-15 11:03:27.184406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import set_safe_timeouts
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f448326c7702'
+down_revision: Union[str, Sequence[str], None] = 'a2dfac16afea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    set_safe_timeouts()
+    op.execute(
+        "ALTER TABLE medicine_intake_history ALTER COLUMN status TYPE smallint USING "
+        "(CASE status WHEN 'TAKEN' THEN 1 WHEN 'MISSED' THEN 2 WHEN 'DELAYED' THEN 3 END)"
+    )
+    op.execute("DROP TYPE intakestatus")
+    op.create_check_constraint('ck_medicine_intake_history_status', 'medicine_intake_history', 'status BETWEEN 1 AND 3')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    set_safe_timeouts()
+    op.drop_constraint('ck_medicine_intake_history_status', 'medicine_intake_history', type_='check')
+    sa.Enum('TAKEN', 'MISSED', 'DELAYED', name='intakestatus').create(op.get_bind())
+    op.execute(
+        "ALTER TABLE medicine_intake_history ALTER COLUMN status TYPE intakestatus USING "
+        "(CASE status WHEN 1 THEN 'TAKEN' WHEN 2 THEN 'MISSED' WHEN 3 THEN 'DELAYED' END)::intakestatus"
+    )
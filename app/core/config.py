@@ -1,40 +1,64 @@
-import os
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic import model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
-
 class Settings(BaseSettings):
     APP_NAME: str = "HeartCoach"
     ENV: str = "development"
-    DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE_SECONDS: int = 3600
+    # Fail a request that can't get a connection instead of letting it queue indefinitely
+    DB_POOL_TIMEOUT_SECONDS: int = 10
+    # Connections opened at startup so the first requests skip the connect handshake
+    DB_POOL_WARMUP: int = 5
+    # Per-connection prepared statement cache; set to 0 behind PgBouncer in transaction mode
+    DB_STATEMENT_CACHE_SIZE: int = 1024
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 14400
+    BCRYPT_ROUNDS: int = 12
     OPENAI_API_KEY: Optional[str] = None
-    REDIS_URL: Optional[str] = None
-    POSTGRES_USER: str = os.getenv("POSTGRES_USER")
-    POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD")
-    POSTGRES_DB: str = os.getenv("POSTGRES_DB")
+    POSTGRES_USER: Optional[str] = None
+    POSTGRES_PASSWORD: Optional[str] = None
+    POSTGRES_DB: Optional[str] = None
     PYTHONUNBUFFERED: int
 
-    EMAIL_HOST: str = "mailhog" if os.getenv("EMAIL_PROVIDER") == "mailhog" else os.getenv("EMAIL_HOST")
-    EMAIL_PORT: int = 1025 if os.getenv("EMAIL_PROVIDER") == "mailhog" else os.getenv("EMAIL_PORT")
+    EMAIL_HOST: Optional[str] = None
+    EMAIL_PORT: Optional[int] = None
     EMAIL_USER: str
     EMAIL_PASSWORD: str
     EMAIL_FROM: str
-    EMAIL_PROVIDER: str = "mailhog" if os.getenv("EMAIL_PROVIDER") == "mailhog" else os.getenv("EMAIL_PROVIDER")
+    EMAIL_PROVIDER: Optional[str] = None
 
-    PHONE_FROM: str = os.getenv("PHONE_FROM")
-    TWILIO_ACCOUNT_SID: str = os.getenv("TWILIO_ACCOUNT_SID")
-    TWILIO_AUTH_TOKEN: str = os.getenv("TWILIO_AUTH_TOKEN")
+    PHONE_FROM: Optional[str] = None
+    TWILIO_ACCOUNT_SID: Optional[str] = None
+    TWILIO_AUTH_TOKEN: Optional[str] = None
 
     REDIS_URL: str | None = "redis://redis:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 64
+
+    OTP_VALIDITY_MINUTES: int = 5
+
+    # sync | async | skip — the container entrypoint already runs `alembic upgrade head`
+    MIGRATION_MODE: str = "skip"
+
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
+
+    @model_validator(mode="after")
+    def apply_mailhog_defaults(self):
+        """MailHog runs as a compose service, so fill in its host/port unless overridden."""
+        if self.EMAIL_PROVIDER == "mailhog":
+            self.EMAIL_HOST = self.EMAIL_HOST or "mailhog"
+            self.EMAIL_PORT = self.EMAIL_PORT or 1025
+        return self
 
-    OTP_VALIDITY_MINUTES: int = os.getenv("OTP_VALIDITY_MINUTES", 5)
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
@@ -0,0 +1,83 @@
+import hashlib
+import time
+from uuid import UUID
+import jwt
+import orjson
+from cachetools import TTLCache
+from fastapi import HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, Response
+from starlette.authentication import AuthCredentials, AuthenticationBackend, AuthenticationError, SimpleUser
+from starlette.requests import HTTPConnection
+
+JWT_CACHE_SIZE = 10_000
+JWT_CACHE_TTL_SECONDS = 5
+JWT_ALGORITHMS = ("HS256",)
+
+MISSING_TOKEN = "Missing or invalid Authorization header"
+INVALID_TOKEN = "Invalid or expired token"
+
+# Failure bodies never change, so serialize them once
+_UNAUTHORIZED = {
+    detail: Response(orjson.dumps({"detail": detail}), status_code=401, media_type="application/json")
+    for detail in (MISSING_TOKEN, INVALID_TOKEN)
+}
+
+
+class JWTAuthBackend(AuthenticationBackend):
+    """Authenticates Bearer JWTs for Starlette's AuthenticationMiddleware; routes read `request.user.username`."""
+
+    def __init__(self, public_exact: frozenset[str], public_prefixes: tuple[str, ...], secret_key: str):
+        self.public_exact = public_exact
+        self.public_prefixes = public_prefixes
+        # Encoded once so PyJWT doesn't re-encode the key on every decode
+        self.secret_key = secret_key.encode("utf-8")
+        # Decoded payloads keyed by token digest. Only touched from the event loop, so no lock needed.
+        self._decoded: TTLCache[bytes, dict] = TTLCache(maxsize=JWT_CACHE_SIZE, ttl=JWT_CACHE_TTL_SECONDS)
+
+    async def authenticate(self, conn: HTTPConnection):
+        # Skip auth for public routes
+        path = conn.scope["path"]
+        if path in self.public_exact or path.startswith(self.public_prefixes):
+            return None
+
+        # Extract token straight from the raw header bytes
+        header = None
+        for name, value in conn.scope["headers"]:
+            if name == b"authorization":
+                header = value
+                break
+        if not header or not header.startswith(b"Bearer "):
+            raise AuthenticationError(MISSING_TOKEN)
+
+        payload = self._decode(header[7:])
+        if payload is None:
+            raise AuthenticationError(INVALID_TOKEN)
+
+        return AuthCredentials(["authenticated"]), SimpleUser(payload.get("sub"))
+
+    def _decode(self, token: bytes) -> dict | None:
+        """Decode a JWT, reusing a recent result for the same token until its own `exp`."""
+        key = hashlib.blake2b(token, digest_size=16).digest()
+        payload = self._decoded.get(key)
+        if payload is not None and payload.get("exp", 0) > time.time():
+            return payload
+
+        try:
+            payload = jwt.decode(token, self.secret_key, algorithms=JWT_ALGORITHMS)
+        except jwt.InvalidTokenError:
+            return None
+        self._decoded[key] = payload
+        return payload
+
+
+def on_auth_error(conn: HTTPConnection, exc: AuthenticationError) -> Response:
+    detail = str(exc)
+    return _UNAUTHORIZED.get(detail) or ORJSONResponse(status_code=401, content={"detail": detail})
+
+
+async def get_user_id(request: Request) -> UUID:
+    """Authenticated user's id, parsed once per request (FastAPI caches dependency results)."""
+    try:
+        return UUID(request.user.username)
+    except (AttributeError, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=INVALID_TOKEN)
@@ -1,16 +1,35 @@
 import hashlib, hmac, secrets, uuid
 from datetime import datetime, timedelta
-from jose import jwt
+from functools import lru_cache
+import jwt
 from app.core.config import settings
 
+_OTP_LENGTH = 6
+_OTP_MOD = 10**_OTP_LENGTH
 
-def gen_numeric_otp(length=6):
-    return str(secrets.randbelow(10**length)).zfill(length)
+
+def gen_numeric_otp(length=_OTP_LENGTH):
+    mod = _OTP_MOD if length == _OTP_LENGTH else 10**length
+    return str(secrets.randbelow(mod)).zfill(length)
+
+
+def gen_numeric_otps(n: int, length=_OTP_LENGTH) -> list[str]:
+    """Bulk variant: one urandom draw reduced mod 10**length (bias < 1e-13 for 64-bit words)."""
+    mod = _OTP_MOD if length == _OTP_LENGTH else 10**length
+    words = memoryview(secrets.token_bytes(n * 8)).cast("Q")
+    return [str(w % mod).zfill(length) for w in words]
+
+
+@lru_cache
+def _otp_hmac_template():
+    # Keyed once; hash_otp copies it instead of re-deriving the HMAC pads per call
+    return hmac.new(settings.OTP_SECRET_KEY.encode(), digestmod=hashlib.sha256)
 
 
 def hash_otp(contact: str, otp: str):
-    msg = f"{contact}|{otp}".encode()
-    return hmac.new(settings.OTP_SECRET_KEY.encode(), msg, hashlib.sha256).hexdigest()
+    h = _otp_hmac_template().copy()
+    h.update(f"{contact}|{otp}".encode())
+    return h.hexdigest()
 
 
 def create_access_token(user_id: int):
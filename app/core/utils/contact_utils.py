@@ -0,0 +1,13 @@
+from typing import Literal
+
+# RFC 5321 caps an address at 254 chars; E.164 phone numbers are far shorter
+MAX_CONTACT_LENGTH = 254
+
+
+def classify_contact(contact: str) -> Literal["email", "phone"]:
+    """Whether an OTP contact is an email address or a phone number.
+
+    Any "@" means email (single linear scan, no regex), matching how contacts
+    were routed before this helper existed.
+    """
+    return "email" if "@" in contact else "phone"
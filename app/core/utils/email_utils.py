@@ -1,47 +1,53 @@
-import os
-import sendgrid
+import logging
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from sendgrid.helpers.mail import Mail
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
 
-EMAIL_PROVIDER = os.getenv("EMAIL_PROVIDER")
-
-
-def send_email(to_email: str, subject: str, body: str, html=False): 
-    if EMAIL_PROVIDER == "mailhog":
-        """Send email via SMTP (MailHog or real SMTP)."""
-        msg = MIMEMultipart()
-        msg["From"] = settings.EMAIL_FROM
-        msg["To"] = to_email
-        msg["Subject"] = subject
-        content_type = "html" if html else "plain"
-        msg.attach(MIMEText(body, content_type))
-
-        with smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT) as server:
-            if settings.EMAIL_HOST not in ["mailhog", "localhost"]:
-                server.starttls()
-                if settings.EMAIL_USER and settings.EMAIL_PASSWORD:
-                    server.login(settings.EMAIL_USER, settings.EMAIL_PASSWORD)
-            server.sendmail(settings.EMAIL_FROM, [to_email], msg.as_string())
-
-        print(f"📤 [SMTP] Email sent to {to_email}")
-        return True
-    else:
-        sg = sendgrid.SendGridAPIClient(api_key=settings.EMAIL_PASSWORD)
-        message = Mail(
-            from_email=settings.EMAIL_FROM,
-            to_emails=to_email,
-            subject=subject,
-            plain_text_content=body if not html else None,
-            html_content=body if html else None,
-        )
+
+# Connections are reused across sends; callers run us in a worker thread, so guard with a thread lock
+_smtp_conn: smtplib.SMTP | None = None
+_smtp_lock = threading.Lock()
+
+
+def _get_smtp_connection() -> smtplib.SMTP:
+    """Return the cached SMTP connection, reconnecting if the server dropped it."""
+    global _smtp_conn
+    if _smtp_conn is not None:
         try:
-            response = sg.send(message)
-            print(f"✅ Email sent to {to_email}, status {response.status_code}")
-            return True
-        except Exception as e:
-            print(f"❌ SendGrid API error: {e}")
-            return False
+            if _smtp_conn.noop()[0] == 250:
+                return _smtp_conn
+        except (smtplib.SMTPException, OSError):
+            pass
+        try:
+            _smtp_conn.close()
+        except OSError:
+            pass
+
+    server = smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT)
+    if settings.EMAIL_HOST not in ["mailhog", "localhost"]:
+        server.starttls()
+        if settings.EMAIL_USER and settings.EMAIL_PASSWORD:
+            server.login(settings.EMAIL_USER, settings.EMAIL_PASSWORD)
+    _smtp_conn = server
+    return server
+
+
+def send_email(to_email: str, subject: str, body: str, html=False):
+    """Send email over SMTP (MailHog or a real SMTP server); SendGrid goes through EmailSender's HTTP client."""
+    msg = MIMEMultipart()
+    msg["From"] = settings.EMAIL_FROM
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    content_type = "html" if html else "plain"
+    msg.attach(MIMEText(body, content_type))
+
+    with _smtp_lock:
+        server = _get_smtp_connection()
+        server.sendmail(settings.EMAIL_FROM, [to_email], msg.as_string())
+
+    logger.info("[SMTP] Email sent to %s", to_email)
+    return True
@@ -0,0 +1,13 @@
+from alembic import op
+
+
+def set_safe_timeouts():
+    """Abort DDL quickly instead of queueing behind long-running queries.
+
+    Only waiting for locks is bounded. Session-level settings outlive the migration's transaction, so a
+    statement_timeout would also cancel table rewrites and CONCURRENTLY index builds (leaving INVALID
+    indexes behind); it is reset to 0 in case the role or database sets one.
+    """
+    op.execute("SET lock_timeout = '2s'")
+    op.execute("SET statement_timeout = 0")
+    op.execute("SET idle_in_transaction_session_timeout = '60s'")
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from redis.asyncio import ConnectionPool, Redis
+
+from app.core.config import settings
+
+# ✅ One connection pool per process, shared by every Redis consumer; None when Redis isn't configured
+redis_pool: Optional[ConnectionPool] = (
+    ConnectionPool.from_url(settings.REDIS_URL, decode_responses=True, max_connections=settings.REDIS_MAX_CONNECTIONS)
+    if settings.REDIS_URL
+    else None
+)
+redis_client: Optional[Redis] = Redis(connection_pool=redis_pool) if redis_pool is not None else None
+
+
+# ✅ Dependency for FastAPI routes
+async def get_redis() -> Optional[Redis]:
+    return redis_client
@@ -1,20 +1,36 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+import orjson
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.core.config import settings
 
 # ✅ Use asyncpg in connection URL
 DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
 
-# ✅ Create async engine
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+# ✅ Create async engine (SQL echo only in development)
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=settings.ENV == "development",
+    future=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    query_cache_size=1200,
+    # JSON/JSONB columns: orjson also handles date, time and UUID values
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
+    connect_args={
+        # Short OLTP queries never benefit from PG's JIT
+        "server_settings": {"jit": "off"},
+        # Reuse server-side prepared statements for repeated queries
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
+)
 
 # ✅ Create async session
-async_session = sessionmaker(
-    bind=engine,
-    expire_on_commit=False,
-    class_=AsyncSession
-)
+async_session = async_sessionmaker(bind=engine, expire_on_commit=False)
 
 # ✅ Dependency for FastAPI routes
 async def get_db():
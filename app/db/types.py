@@ -0,0 +1,35 @@
+from sqlalchemy import SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class SmallIntEnum(TypeDecorator):
+    """Stores a Python enum as a SMALLINT code from an explicit ``{member: code}`` mapping.
+
+    Codes are persisted, so never renumber an existing member. Values are
+    matched by ``.value``, so any str enum (or plain string) with the same
+    value binds to the same code.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls, codes, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        missing = set(enum_cls) - set(codes)
+        if missing:
+            raise ValueError(f"No SMALLINT code for {sorted(m.name for m in missing)}")
+        self.enum_cls = enum_cls
+        # Tuple keeps the type hashable for the statement cache (cache_ok)
+        self.codes = tuple(sorted(codes.items(), key=lambda mc: mc[1]))
+        self._codes = dict(self.codes)
+        self._members = {code: member for member, code in self.codes}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._codes[self.enum_cls(getattr(value, "value", value))]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[value]
@@ -1,14 +1,121 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+import asyncio
+import enum
+import logging
+from contextlib import asynccontextmanager
+
+import anyio
+from alembic import command
+from alembic.config import Config
+import orjson
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
-from jose import jwt, JWTError
+from sqlalchemy import text
+from starlette.middleware.authentication import AuthenticationMiddleware
 from app.core.config import settings
+from app.core.middleware import JWTAuthBackend, on_auth_error
+from app.db.redis import redis_pool
+from app.db.session import engine
 from app.routers.api_v1 import auth, health, user, vitals, medicine, water
+from app.services.senders.email_sender import sendgrid_client, smtp_pool
+from app.services.senders.phone_sender import twilio_client
+
+logger = logging.getLogger(__name__)
+
+# Public (unauthenticated) routes: exact hits via set lookup, sub-paths via C-level tuple startswith
+PUBLIC_EXACT = frozenset({
+    "/api/v1/auth/health",
+    "/api/v1/auth/request-otp",
+    "/api/v1/auth/verify-otp",
+    "/api/v1/auth/resend-otp",
+    "/docs",
+    "/openapi.json",
+    "/redoc",
+})
+PUBLIC_PREFIXES = ("/docs/", "/redoc/")
+
+# Swagger "Authorize" support for the JWT Bearer scheme
+BEARER_SECURITY_SCHEMES = {
+    "bearerAuth": {
+        "type": "http",
+        "scheme": "bearer",
+        "bearerFormat": "JWT",
+    }
+}
+BEARER_SECURITY = [{"bearerAuth": []}]
+
+
+class MigrationStatus(str, enum.Enum):
+    SKIPPED = "skipped"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+async def unhandled_exception_handler(request: Request, exc: Exception) -> Response:
+    # Starlette re-raises after responding, so the server still logs the traceback
+    return ORJSONResponse(status_code=500, content={"detail": "Internal Server Error"})
+
+
+def _upgrade_head():
+    command.upgrade(Config("alembic.ini"), "head")
+
+
+async def _run_migrations(app: FastAPI):
+    app.state.migration_status = MigrationStatus.RUNNING
+    try:
+        await anyio.to_thread.run_sync(_upgrade_head)
+    except Exception:
+        logger.exception("Alembic migration failed")
+        app.state.migration_status = MigrationStatus.FAILED
+        # Sync mode means "don't serve until the schema is current", so fail startup
+        if settings.MIGRATION_MODE == "sync":
+            raise
+        return
+    app.state.migration_status = MigrationStatus.DONE
+
+
+async def _warm_pool(size: int):
+    async def checkout():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Concurrent checkouts, so each one opens its own connection
+    try:
+        await asyncio.gather(*(checkout() for _ in range(size)))
+    except Exception:
+        logger.warning("Connection pool warm-up failed", exc_info=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Optionally apply migrations on startup, depending on MIGRATION_MODE."""
+    app.state.migration_status = MigrationStatus.SKIPPED
+    task = None
+    if settings.MIGRATION_MODE == "sync":
+        await _run_migrations(app)
+    elif settings.MIGRATION_MODE == "async":
+        # Accept requests right away; /health reports progress
+        task = asyncio.create_task(_run_migrations(app))
+    await _warm_pool(min(settings.DB_POOL_WARMUP, settings.DB_POOL_SIZE))
+    # Build and serialize the OpenAPI schema now rather than on the first /docs hit
+    app.state.openapi_bytes = orjson.dumps(app.openapi())
+    yield
+    if task and not task.done():
+        task.cancel()
+    if redis_pool is not None:
+        await redis_pool.disconnect()
+    await sendgrid_client.aclose()
+    await twilio_client.aclose()
+    # Drop queued MailHog sends rather than block shutdown on a hung SMTP server
+    smtp_pool.shutdown(wait=False, cancel_futures=True)
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.APP_NAME)
+    app = FastAPI(title=settings.APP_NAME, default_response_class=ORJSONResponse, lifespan=lifespan)
+    # One generic 500 for anything unexpected, instead of try/except in every handler
+    app.add_exception_handler(Exception, unhandled_exception_handler)
 
     app.add_middleware(
         CORSMiddleware,
@@ -21,40 +128,15 @@ def create_app() -> FastAPI:
     # -----------------------------------------------------
     # 🧩 JWT Auth Middleware
     # -----------------------------------------------------
-    @app.middleware("http")
-    async def jwt_middleware(request: Request, call_next):
-        """Global middleware to check JWT Bearer tokens."""
-        # Public (unauthenticated) routes
-        public_paths = [
-            "/api/v1/auth/health",
-            "/api/v1/auth/request-otp",
-            "/api/v1/auth/verify-otp",
-            "/api/v1/auth/resend-otp",
-            "/docs",
-            "/openapi.json",
-            "/redoc",
-        ]
-
-        # Skip auth for public routes
-        if any(request.url.path.startswith(p) for p in public_paths):
-            return await call_next(request)
-
-        # Extract token
-        token = request.headers.get("Authorization")
-        if not token or not token.startswith("Bearer "):
-            return JSONResponse(
-                status_code=401, content={"detail": "Missing or invalid Authorization header"}
-            )
-
-        try:
-            # Decode JWT
-            payload = jwt.decode(token.split(" ")[1], settings.SECRET_KEY, algorithms=["HS256"])
-            # Store user_id in request.state for access in routes
-            request.state.user_id = payload.get("sub")
-        except JWTError:
-            return JSONResponse(status_code=401, content={"detail": "Invalid or expired token"})
-
-        return await call_next(request)
+    app.add_middleware(
+        AuthenticationMiddleware,
+        backend=JWTAuthBackend(
+            public_exact=PUBLIC_EXACT,
+            public_prefixes=PUBLIC_PREFIXES,
+            secret_key=settings.SECRET_KEY,
+        ),
+        on_error=on_auth_error,
+    )
 
     # -----------------------------------------------------
     # 🧩 OpenAPI Customization for Swagger Auth Support
@@ -69,19 +151,21 @@ def create_app() -> FastAPI:
             description="HeartCoach API with JWT Middleware Auth",
             routes=app.routes,
         )
-        openapi_schema["components"]["securitySchemes"] = {
-            "bearerAuth": {
-                "type": "http",
-                "scheme": "bearer",
-                "bearerFormat": "JWT",
-            }
-        }
-        openapi_schema["security"] = [{"bearerAuth": []}]
+        openapi_schema["components"]["securitySchemes"] = BEARER_SECURITY_SCHEMES
+        openapi_schema["security"] = BEARER_SECURITY
         app.openapi_schema = openapi_schema
         return app.openapi_schema
 
     app.openapi = custom_openapi
 
+    async def openapi_json(request: Request) -> Response:
+        body = getattr(app.state, "openapi_bytes", None) or orjson.dumps(app.openapi())
+        return Response(body, media_type="application/json")
+
+    # Swap FastAPI's default route, which re-encodes the schema on every request
+    app.router.routes[:] = [r for r in app.router.routes if getattr(r, "path", None) != app.openapi_url]
+    app.add_route(app.openapi_url, openapi_json, include_in_schema=False)
+
     # -----------------------------------------------------
     # 🧩 Routers
     # -----------------------------------------------------
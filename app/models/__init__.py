@@ -0,0 +1,3 @@
+# Import every model module so relationship() string targets resolve whenever any model is used,
+# e.g. by statements built at import time in the repositories.
+from app.models import medicine, user, vitals, water  # noqa: F401
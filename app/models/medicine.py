@@ -1,10 +1,12 @@
-from sqlalchemy import Column, DateTime, String, Date, Text, Time, ForeignKey, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import CheckConstraint, Column, DateTime, Index, String, Date, Text, Time, ForeignKey, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
-from datetime import date, datetime
+from datetime import date
 import enum, uuid
 
+from app.core.utils.uuid_utils import uuid7
 from app.db.base_class import Base
+from app.db.types import SmallIntEnum
 
 
 class MedicineStatus(str, enum.Enum):
@@ -19,11 +21,15 @@ class IntakeStatus(str, enum.Enum):
     DELAYED = "delayed"
 
 
+# Persisted SMALLINT codes for medicine_intake_history.status; never renumber
+INTAKE_STATUS_CODES = {IntakeStatus.TAKEN: 1, IntakeStatus.MISSED: 2, IntakeStatus.DELAYED: 3}
+
+
 class Medicine(Base):
     __tablename__ = "medicines"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
 
     name = Column(String, nullable=False)
     dosage = Column(String, nullable=False)  # e.g. "2mg"
@@ -39,6 +45,14 @@ class Medicine(Base):
 
 class MedicineSchedule(Base):
     __tablename__ = "medicine_schedules"
+    __table_args__ = (
+        # Covers the whole row, so selectin-loading schedules by medicine_id is an index-only scan
+        Index(
+            "ix_medicine_schedules_medicine_id_cov",
+            "medicine_id",
+            postgresql_include=["id", "user_id", "time_of_day", "dose_label", "dosage"],
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     medicine_id = Column(UUID(as_uuid=True), ForeignKey("medicines.id", ondelete="CASCADE"), nullable=False)
@@ -54,30 +68,40 @@ class MedicineSchedule(Base):
 class MedicineHistory(Base):
     __tablename__ = "medicine_history"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     medicine_id = Column(UUID(as_uuid=True), ForeignKey("medicines.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     change_type = Column(String, nullable=False)        # e.g. "update_dosage", "time_changed"
-    old_value = Column(Text, nullable=True)
-    new_value = Column(Text, nullable=True)
-    changed_at = Column(DateTime, default=datetime.utcnow)
+    old_value = Column(JSONB, nullable=True)
+    new_value = Column(JSONB, nullable=True)
+    changed_at = Column(DateTime, server_default=text("timezone('utc', now())"))
 
     medicine = relationship("Medicine", back_populates="history")
 
 
 class MedicineIntakeHistory(Base):
     __tablename__ = "medicine_intake_history"
-
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __table_args__ = (
+        CheckConstraint(
+            f"status BETWEEN {min(INTAKE_STATUS_CODES.values())} AND {max(INTAKE_STATUS_CODES.values())}",
+            name="ck_medicine_intake_history_status",
+        ),
+        # get_medicine_history: filter on user/medicine, newest first, no sort step
+        Index("ix_medicine_intake_history_user_medicine_taken", "user_id", "medicine_id", text("taken_at DESC")),
+    )
+    # Fetch taken_at/recorded_at via INSERT ... RETURNING so callers don't refresh after commit
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     medicine_id = Column(UUID(as_uuid=True), ForeignKey("medicines.id", ondelete="CASCADE"), nullable=False)
     schedule_id = Column(UUID(as_uuid=True), ForeignKey("medicine_schedules.id", ondelete="CASCADE"), nullable=True)
 
-    status = Column(Enum(IntakeStatus), nullable=False)
+    status = Column(SmallIntEnum(IntakeStatus, INTAKE_STATUS_CODES), nullable=False)
     note = Column(Text, nullable=True)
-    taken_at = Column(DateTime, default=datetime.utcnow)
-    recorded_at = Column(DateTime, default=datetime.utcnow)
+    taken_at = Column(DateTime, server_default=text("timezone('utc', now())"))
+    recorded_at = Column(DateTime, server_default=text("timezone('utc', now())"))
 
     medicine = relationship("Medicine")
     schedule = relationship("MedicineSchedule")
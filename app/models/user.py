@@ -8,7 +8,7 @@ from app.db.base_class import Base
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email: str = Column(String, unique=True, index=True)
     phone_number: str = Column(String, unique=True, index=True)
     # Relationship to UserInfo
@@ -23,7 +23,10 @@ class UserInfo(Base):
     __tablename__ = "users_info"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Unique: one profile per user, and the arbiter for the profile upsert
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True, unique=True
+    )
 
     first_name: str | None = Column(String)
     last_name: str | None = Column(String)
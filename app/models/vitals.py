@@ -1,9 +1,8 @@
-from sqlalchemy import Column, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Float, DateTime, ForeignKey, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from datetime import datetime
 import enum
-import uuid
+from app.core.utils.uuid_utils import uuid7
 from app.db.base_class import Base  # Assuming you have a Base from SQLAlchemy setup
 
 
@@ -16,8 +15,14 @@ class ReadingTime(str, enum.Enum):
 
 class UserVital(Base):
     __tablename__ = "user_vitals"
-
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __table_args__ = (
+        # Keyset pagination in get_my_vitals walks this index newest-first
+        Index("ix_user_vitals_user_recorded_at", "user_id", text("recorded_at DESC")),
+    )
+    # Fetch recorded_at via INSERT ... RETURNING so callers don't refresh after commit
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     # Optional health metrics
@@ -29,7 +34,7 @@ class UserVital(Base):
 
     # Reading context
     reading_time = Column(Enum(ReadingTime), nullable=False)
-    recorded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    recorded_at = Column(DateTime, server_default=text("timezone('utc', now())"), nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="vitals")
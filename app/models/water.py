@@ -1,28 +1,37 @@
-from sqlalchemy import Column, Integer, Date, ForeignKey
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-import uuid
-from datetime import date
+from app.core.utils.uuid_utils import uuid7
 from app.db.base_class import Base
 
 
 class WaterGoal(Base):
     __tablename__ = "water_goals"
+    __table_args__ = (
+        # Latest goal per user straight off the index, goal_ml included
+        Index("ix_water_goals_user_created_at", "user_id", text("created_at DESC"), postgresql_include=["goal_ml"]),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Time-ordered, so it breaks ties between goals set on the same day (created_at is only a date)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     goal_ml = Column(Integer, nullable=False)
-    created_at = Column(Date, default=date.today)
+    created_at = Column(Date, server_default=func.current_date())
 
     user = relationship("User", back_populates="water_goals")
 
 
 class WaterIntake(Base):
     __tablename__ = "water_intake"
+    __table_args__ = (
+        # One row per user per day (the ON CONFLICT target); INCLUDE keeps the
+        # per-day total lookup answerable from the index alone
+        Index("uq_water_intake_user_date", "user_id", "date", unique=True, postgresql_include=["intake_ml"]),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     intake_ml = Column(Integer, nullable=False)
-    date = Column(Date, default=date.today)
+    date = Column(Date, nullable=False, server_default=func.current_date())
 
     user = relationship("User", back_populates="water_intake")
@@ -1,7 +1,8 @@
 # app/repositories/user_info_repo.py
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.models.user import UserInfo
 
 
@@ -12,24 +13,17 @@ class UserInfoRepository:
     async def get_by_user_id(self, user_id: int):
         q = select(UserInfo).where(UserInfo.user_id == user_id)
         res = await self.db.execute(q)
-        return res.scalars().first()
+        return res.scalar_one_or_none()
 
-    async def create_user_info(self, user_id: int, user_info) -> UserInfo:
+    async def upsert(self, user_id: int, user_info) -> UserInfo:
+        """Create the user's profile row, or update the given fields if it exists — one round-trip."""
         data = user_info.model_dump(exclude_unset=True)
-        info = UserInfo(user_id=user_id, **data)
-        self.db.add(info)
-        await self.db.commit()
-        await self.db.refresh(info)
-        return info
-
-    async def update_user_info(self, user_id: int, user_info) -> UserInfo:
-        data = user_info.model_dump(exclude_unset=True)
-        q = (
-            update(UserInfo)
-            .where(UserInfo.user_id == user_id)
-            .values(**data)
-            .returning(UserInfo)
-        )
+        q = pg_insert(UserInfo).values(user_id=user_id, **data)
+        q = q.on_conflict_do_update(
+            index_elements=["user_id"],
+            # An empty payload still has to touch the row for RETURNING to hand it back
+            set_=data or {"user_id": q.excluded.user_id},
+        ).returning(UserInfo)
         res = await self.db.execute(q)
         await self.db.commit()
-        return res.scalars().first()
+        return res.scalar_one()
@@ -1,10 +1,22 @@
 # app/repositories/user_repo.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, insert, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.utils.contact_utils import classify_contact
 from app.models.user import User, UserInfo
 from typing import Optional, Tuple
 from app.schemas.user import UserCreate, UserInfoCreate
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, raiseload
+
+# Hot lookups are built once at import; callers only bind parameters
+_GET_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_GET_BY_PHONE = select(User).where(User.phone_number == bindparam("phone"))
+# One-to-one: a JOIN can't multiply rows, so it saves selectinload's second round trip
+_GET_USER_WITH_INFO = (
+    select(User)
+    .options(joinedload(User.info), raiseload("*"))
+    .where(User.id == bindparam("user_id"))
+)
 
 
 class UserRepository:
@@ -12,65 +24,50 @@ class UserRepository:
         self.session = session
 
     async def get_by_email(self, email: str) -> Optional[User]:
-        q = select(User).where(User.email == email)
-        result = await self.session.execute(q)
-        return result.scalars().first()
+        result = await self.session.execute(_GET_BY_EMAIL, {"email": email})
+        return result.scalar_one_or_none()
 
     async def get_by_phone(self, phone: str) -> Optional[User]:
-        q = select(User).where(User.phone_number == phone)
-        result = await self.session.execute(q)
-        return result.scalars().first()
+        result = await self.session.execute(_GET_BY_PHONE, {"phone": phone})
+        return result.scalar_one_or_none()
 
     async def get_user_with_info(self, user_id: str):
-        q = (
-            select(User)
-            .options(selectinload(User.info))
-            .where(User.id == user_id)
-        )
-        result = await self.session.execute(q)
-        return result.scalars().first()
+        result = await self.session.execute(_GET_USER_WITH_INFO, {"user_id": user_id})
+        return result.scalar_one_or_none()
 
     async def create(self, user_in: UserCreate) -> User:
         # Convert Pydantic → ORM
         user_data = user_in.model_dump(exclude_unset=True)
-        user = User(**user_data)
-
-        self.session.add(user)
+        q = insert(User).values(**user_data).returning(User)
+        result = await self.session.execute(q)
         await self.session.commit()
-        await self.session.refresh(user)
-        return user
+        return result.scalar_one()
 
     async def create_user_info(self, user_id: int, user_info: UserInfoCreate) -> UserInfo:
-        if hasattr(user_info, "model_dump"):
-            user_info_data = user_info.model_dump(exclude_unset=True)
-        else:
-            user_info_data = user_info.dict(exclude_unset=True)
-        info = UserInfo(user_id=user_id, **user_info_data)
-        self.db.add(info)
-        await self.db.commit()
-        await self.db.refresh(info)
-        return info
+        user_info_data = user_info.model_dump(exclude_unset=True)
+        q = insert(UserInfo).values(user_id=user_id, **user_info_data).returning(UserInfo)
+        result = await self.session.execute(q)
+        await self.session.commit()
+        return result.scalar_one()
 
     async def get(self, user_id: int) -> Optional[User]:
-        q = select(User).where(User.id == user_id)
-        result = await self.session.execute(q)
-        return result.scalars().first()
+        # Identity-map hit skips the SELECT when the user is already in this session
+        return await self.session.get(User, user_id)
 
     async def get_or_create_by_contact(self, contact: str) -> Tuple[User, bool]:
         """
         If contact looks like an email, fetch/create by email; else by phone.
-        Returns (user, created_flag)
+        Returns (user, created_flag) from a single upsert round trip.
         """
-        if "@" in contact:
-            existing = await self.get_by_email(contact)
-            if existing:
-                return existing, False
-            user_in = UserCreate(email=contact)
-        else:
-            existing = await self.get_by_phone(contact)
-            if existing:
-                return existing, False
-            user_in = UserCreate(phone_number=contact)
+        column = "email" if classify_contact(contact) == "email" else "phone_number"
+        user_in = UserCreate(**{column: contact})
 
-        user = await self.create(user_in)
-        return user, True
+        q = pg_insert(User).values(**user_in.model_dump(exclude_unset=True))
+        # No-op update so the existing row is still RETURNed; xmax = 0 only on a fresh insert
+        q = q.on_conflict_do_update(
+            index_elements=[column], set_={column: q.excluded[column]}
+        ).returning(User, literal_column("xmax = 0").label("created"))
+        result = await self.session.execute(q)
+        await self.session.commit()
+        user, created = result.one()
+        return user, created
@@ -1,20 +1,24 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update
 from sqlalchemy.future import select
+from sqlalchemy.orm import raiseload
 from app.models.vitals import UserVital
 
 
 class VitalRepository:
     async def get_by_id(self, db: AsyncSession, vital_id: int, user_id: int):
-        result = await db.execute(select(UserVital).where(UserVital.id == vital_id, UserVital.user_id == user_id))
-        return result.scalars().first()
+        # Ownership check needs the user_id predicate, so this stays a query rather than db.get()
+        q = select(UserVital).where(UserVital.id == vital_id, UserVital.user_id == user_id).options(raiseload("*"))
+        result = await db.execute(q)
+        return result.scalar_one_or_none()
 
     async def update(self, db: AsyncSession, vital: UserVital, data: dict):
-        for key, value in data.items():
-            setattr(vital, key, value)
-        db.add(vital)
+        if not data:
+            return vital
+        q = update(UserVital).where(UserVital.id == vital.id).values(**data).returning(UserVital)
+        result = await db.execute(q)
         await db.commit()
-        await db.refresh(vital)
-        return vital
+        return result.scalar_one()
 
     async def delete(self, db: AsyncSession, vital: UserVital):
         await db.delete(vital)
@@ -1,24 +1,33 @@
 # app/routes/auth.py
+import logging
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from redis.asyncio import Redis
 
+from app.core.utils.contact_utils import MAX_CONTACT_LENGTH
+from app.db.redis import get_redis, redis_client
 from app.db.session import get_db
 from app.repositories.user_repo import UserRepository
 from app.schemas.otp import ResendOtpRequest
-from app.services.otp_service import OTPService
+from app.schemas.user import UserResponse
+from app.services.otp_service import OTPService, OTPThrottled
 from app.services.auth_service import AuthService
+from app.services.profile_cache import store_profile
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 class RequestOTPIn(BaseModel):
-    contact: str
+    contact: str = Field(..., max_length=MAX_CONTACT_LENGTH)
 
 
 class VerifyOTPIn(BaseModel):
-    contact: str
+    contact: str = Field(..., max_length=MAX_CONTACT_LENGTH)
     otp: str
 
 
@@ -27,9 +36,12 @@ class TokenResponse(BaseModel):
     token_type: str = "bearer"
 
 
+# Stateless apart from the shared Redis client, so one instance serves every request
+_OTP_SERVICE = OTPService(redis_client=redis_client)
+
+
 async def get_otp_service() -> OTPService:
-    # could accept injected redis client in future
-    return OTPService()
+    return _OTP_SERVICE
 
 
 async def get_auth_service(db: AsyncSession = Depends(get_db)) -> AuthService:
@@ -42,7 +54,10 @@ async def request_otp(payload: RequestOTPIn, otp_service: OTPService = Depends(g
     """
     Generate and send OTP to contact (email or phone).
     """
-    ok = await otp_service.generate_and_send(payload.contact)
+    try:
+        ok = await otp_service.generate_and_send(payload.contact)
+    except OTPThrottled:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="OTP already sent, try again shortly")
     if not ok:
         raise HTTPException(status_code=500, detail="Failed to send OTP")
     return {"message": f"OTP sent to {payload.contact}"}
@@ -54,6 +69,7 @@ async def verify_otp(
     db: AsyncSession = Depends(get_db),
     otp_service: OTPService = Depends(get_otp_service),
     auth_svc: AuthService = Depends(get_auth_service),
+    redis: Optional[Redis] = Depends(get_redis),
 ):
     """
     Verify OTP; if valid, get_or_create the user and return a JWT access token.
@@ -68,6 +84,15 @@ async def verify_otp(
 
     # Optionally: on user creation set defaults (e.g., is_active True) — repo.create handles that
 
+    if created:
+        # A brand-new user has no profile yet, so the /user/me that follows login needs no query.
+        # Best-effort: the OTP is already accepted, so a cache problem must not block the token.
+        try:
+            me = UserResponse(id=user.id, email=user.email, phone_number=user.phone_number, info=None)
+            await store_profile(redis, user.id, me.model_dump_json())
+        except Exception:
+            logger.warning("Profile pre-warm failed for %s", user.id, exc_info=True)
+
     # Issue JWT token using AuthService
     token = auth_svc.create_access_token(subject=str(user.id))
     return TokenResponse(access_token=token)
@@ -80,9 +105,8 @@ async def resend_otp(payload: ResendOtpRequest, otp_service: OTPService = Depend
 
     try:
         success = await otp_service.fetch_and_send(payload.email or payload.phone_number)
-        if success:
-            return {"message": "OTP resent successfully"}
-        else:
-            raise HTTPException(status_code=400, detail="Failed to resend OTP")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error resending OTP: {str(e)}")
+    except OTPThrottled:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="OTP already sent, try again shortly")
+    if not success:
+        raise HTTPException(status_code=400, detail="Failed to resend OTP")
+    return {"message": "OTP resent successfully"}
@@ -1,8 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from app.db.session import engine
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.get("/health")
-async def health_check():
-    return {"status": "ok"}
+async def health_check(request: Request):
+    return {
+        "status": "ok",
+        "migrations": getattr(request.app.state, "migration_status", None),
+        "db_pool": engine.pool.status(),
+    }
@@ -1,25 +1,111 @@
-import json
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy import delete
+import uuid
+from collections import defaultdict
+from functools import lru_cache
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import bindparam, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.middleware import get_user_id
+from app.core.utils.uuid_utils import uuid7
 from app.db.session import get_db
 from app.models.medicine import Medicine, MedicineIntakeHistory, MedicineSchedule, MedicineHistory
-from app.schemas.medicine import MedicineIntakeCreate, MedicineIntakeRead, MedicineRead, MedicineCreate, MedicineScheduleRead, MedicineUpdate
+from app.schemas.medicine import MedicineIntakeCreate, MedicineIntakeRead, MedicineRead, MedicineCreate, MedicineUpdate
 
 router = APIRouter(prefix="/api/v1/medicine", tags=["Medicine"])
 
+# Statements are built once at import; handlers only bind parameters
+_GET_MEDICINES = (
+    select(Medicine)
+    .options(selectinload(Medicine.schedules), raiseload("*"))
+    .where(Medicine.user_id == bindparam("user_id"))
+)
+_OWNED_MEDICINE = (Medicine.id == bindparam("medicine_id"), Medicine.user_id == bindparam("user_id"))
+_GET_MEDICINE_WITH_SCHEDULES = (
+    select(Medicine).options(selectinload(Medicine.schedules), raiseload("*")).where(*_OWNED_MEDICINE)
+)
+_GET_MEDICINE = select(Medicine).where(*_OWNED_MEDICINE)
+# INSERT ... SELECT: inserts nothing when the medicine doesn't belong to the user.
+# Core insert on the table: the ORM bulk path can't take from_select(); id is bound explicitly since
+# the Python-side uuid7 default isn't applied to INSERT ... SELECT
+_INTAKE_HISTORY = MedicineIntakeHistory.__table__
+_MARK_STATUS = (
+    insert(_INTAKE_HISTORY)
+    .from_select(
+        ["id", "user_id", "medicine_id", "schedule_id", "status", "note"],
+        select(
+            bindparam("id", type_=_INTAKE_HISTORY.c.id.type),
+            bindparam("user_id", type_=_INTAKE_HISTORY.c.user_id.type),
+            Medicine.id,
+            bindparam("schedule_id", type_=_INTAKE_HISTORY.c.schedule_id.type),
+            bindparam("status", type_=_INTAKE_HISTORY.c.status.type),
+            bindparam("note", type_=_INTAKE_HISTORY.c.note.type),
+        ).where(*_OWNED_MEDICINE),
+    )
+    .returning(*_INTAKE_HISTORY.c)
+)
+_GET_INTAKE_HISTORY = (
+    select(MedicineIntakeHistory)
+    .where(
+        MedicineIntakeHistory.medicine_id == bindparam("medicine_id"),
+        MedicineIntakeHistory.user_id == bindparam("user_id"),
+    )
+    .order_by(MedicineIntakeHistory.taken_at.desc())
+    .execution_options(yield_per=100)
+)
+
+
+@lru_cache
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def _encode_batch(adapter: TypeAdapter, batch) -> bytes:
+    # Validate the whole batch before any of it is written, then strip the list brackets
+    return adapter.dump_json(adapter.validate_python(batch, from_attributes=True))[1:-1]
+
+
+async def _json_array(rows, schema: type[BaseModel]):
+    """Encode ORM rows as a JSON array one yield_per batch at a time, so the full list is never materialized.
+
+    The first batch is encoded before the response starts: a row that fails validation there surfaces as a
+    normal 500 instead of a 200 with a truncated body.
+    """
+    adapter = _list_adapter(schema)
+    batches = rows.partitions()
+    first = _encode_batch(adapter, await anext(batches, []))
+
+    async def body():
+        yield b"[" + first
+        sep = b"," if first else b""
+        async for batch in batches:
+            chunk = _encode_batch(adapter, batch)
+            if chunk:
+                yield sep + chunk
+                sep = b","
+        yield b"]"
+
+    return body()
+
+
+def _schedules_value(schedules: list[tuple]) -> list[dict]:
+    return [{"time_of_day": t, "dose_label": label, "dosage": dosage} for t, label, dosage in schedules]
+
 
 @router.post("/", response_model=MedicineRead)
 async def create_medicine(
-    request: Request,
     payload: MedicineCreate,
+    user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    user_id = getattr(request.state, "user_id", None)
+    # Client-side id so the schedules can reference it without an explicit flush
     medicine = Medicine(
+        id=uuid.uuid4(),
         user_id=user_id,
         name=payload.name,
         dosage=payload.dosage,
@@ -29,87 +115,65 @@ async def create_medicine(
     )
 
     db.add(medicine)
-    await db.flush()
-
-    for s in payload.schedules:
-        schedule = MedicineSchedule(
-            medicine_id=medicine.id,
-            user_id=user_id,
-            time_of_day=s.time_of_day,
-            dose_label=s.dose_label,
-            dosage=s.dosage,
+
+    # One multi-row INSERT ... RETURNING instead of a statement per schedule;
+    # autoflush sends the medicine row first
+    schedules = []
+    if payload.schedules:
+        result = await db.scalars(
+            insert(MedicineSchedule).returning(MedicineSchedule, sort_by_parameter_order=True),
+            [{"medicine_id": medicine.id, "user_id": user_id, **s.model_dump()} for s in payload.schedules],
         )
-        db.add(schedule)
+        schedules = result.all()
 
     await db.commit()
-    await db.refresh(medicine)
+    # Nothing on Medicine is server-generated, so skip the reload SELECT
+    set_committed_value(medicine, "schedules", schedules)
     return medicine
 
 
 @router.get("/", response_model=list[MedicineRead])
 async def get_medicines(
-    request: Request,
+    user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    user_id = getattr(request.state, "user_id", None)
-    result = await db.execute(select(Medicine)
-                              .options(selectinload(Medicine.schedules))
-                              .where(Medicine.user_id == user_id))
-    return result.scalars().unique().all()
+    # Server-side cursor: rows are fetched and hydrated 100 at a time (schedules selectin-loaded per batch)
+    result = await db.stream_scalars(_GET_MEDICINES.execution_options(yield_per=100), {"user_id": user_id})
+    return StreamingResponse(await _json_array(result, MedicineRead), media_type="application/json")
 
 
 @router.put("/{medicine_id}", response_model=MedicineRead)
 async def update_medicine(
-    request: Request,
     medicine_id: str,
     payload: MedicineUpdate,
+    user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    user_id = getattr(request.state, "user_id", None)
-
     # Fetch the medicine with schedules eagerly loaded
-    result = await db.execute(
-        select(Medicine)
-        .options(selectinload(Medicine.schedules))
-        .where(Medicine.id == medicine_id, Medicine.user_id == user_id)
-    )
+    result = await db.execute(_GET_MEDICINE_WITH_SCHEDULES, {"medicine_id": medicine_id, "user_id": user_id})
     medicine = result.scalar_one_or_none()
     if not medicine:
         raise HTTPException(status_code=404, detail="Medicine not found")
 
     # --- Track simple field changes ---
-    for field, new_value in payload.dict(exclude_unset=True, exclude={"schedules"}).items():
+    for field, new_value in payload.model_dump(exclude_unset=True, exclude={"schedules"}).items():
         old_value = getattr(medicine, field, None)
         if old_value != new_value:
             history = MedicineHistory(
                 medicine_id=medicine.id,
                 user_id=user_id,
                 change_type=f"{field}_changed",
-                old_value=str(old_value),
-                new_value=str(new_value)
+                old_value=old_value,
+                new_value=new_value
             )
             db.add(history)
             setattr(medicine, field, new_value)
 
     # --- Track schedule changes ---
     if payload.schedules:
-        # Convert time objects to strings for JSON serialization
-        old_schedules = [
-            {
-                "time_of_day": s.time_of_day.isoformat(),
-                "dose_label": s.dose_label,
-                "dosage": s.dosage
-            }
-            for s in medicine.schedules
-        ]
-        new_schedules = [
-            {
-                "time_of_day": s.time_of_day.isoformat(),
-                "dose_label": s.dose_label,
-                "dosage": s.dosage
-            }
-            for s in payload.schedules
-        ]
+        # Compare plain tuples; the history payload is only built when something changed
+        old_schedules = [(s.time_of_day, s.dose_label, s.dosage) for s in medicine.schedules]
+        new_schedules = [(s.time_of_day, s.dose_label, s.dosage) for s in payload.schedules]
 
         # Add history if schedules changed
         if old_schedules != new_schedules:
@@ -117,57 +181,57 @@ async def update_medicine(
                 medicine_id=medicine.id,
                 user_id=user_id,
                 change_type="schedules_changed",
-                old_value=json.dumps(old_schedules),
-                new_value=json.dumps(new_schedules)
+                old_value=_schedules_value(old_schedules),
+                new_value=_schedules_value(new_schedules)
             )
             db.add(history)
 
-        # Delete old schedules and add new ones
-        await db.execute(
-            delete(MedicineSchedule).where(MedicineSchedule.medicine_id == medicine_id)
-        )
+        # Diff against the loaded schedules by time_of_day: update matches in place,
+        # delete the ones no longer present and bulk-insert the new ones. Rows are grouped
+        # per time_of_day so duplicate times pair off one-to-one and any extras get deleted
+        existing = defaultdict(list)
+        for s in medicine.schedules:
+            existing[s.time_of_day].append(s)
+        schedules = []  # payload order; None marks a row still to be inserted
+        new_rows = []
         for s in payload.schedules:
-            db.add(
-                MedicineSchedule(
-                    medicine_id=medicine.id,
-                    user_id=user_id,
-                    time_of_day=s.time_of_day,
-                    dose_label=s.dose_label,
-                    dosage=s.dosage
-                )
+            same_time = existing.get(s.time_of_day)
+            current = same_time.pop(0) if same_time else None
+            if current is None:
+                new_rows.append({"medicine_id": medicine.id, "user_id": user_id, **s.model_dump()})
+            else:
+                # Only emits an UPDATE if a value actually changed
+                current.dose_label = s.dose_label
+                current.dosage = s.dosage
+            schedules.append(current)
+
+        stale_ids = [s.id for rows in existing.values() for s in rows]
+        if stale_ids:
+            await db.execute(delete(MedicineSchedule).where(MedicineSchedule.id.in_(stale_ids)))
+        if new_rows:
+            result = await db.scalars(
+                insert(MedicineSchedule).returning(MedicineSchedule, sort_by_parameter_order=True), new_rows
             )
+            inserted = iter(result.all())
+            schedules = [s if s is not None else next(inserted) for s in schedules]
 
     # Commit all changes
     await db.commit()
-    await db.refresh(medicine)  # Refresh to get updated values
-
-    # --- Prepare response safely ---
-    schedules_list = [
-        MedicineScheduleRead(
-            id=s.id,
-            time_of_day=s.time_of_day,
-            dose_label=s.dose_label,
-            dosage=s.dosage
-        ) for s in medicine.schedules
-    ]
-
-    response = MedicineRead(
-        id=medicine.id,
-        name=medicine.name,
-        dosage=medicine.dosage,
-        schedules=schedules_list
-    )
-    return response
+    if payload.schedules:
+        # Everything written is already in memory, so no reload SELECT is needed
+        set_committed_value(medicine, "schedules", schedules)
+
+    # response_model validates straight from the ORM attributes (schedules included)
+    return medicine
 
 
 @router.delete("/{medicine_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_medicine(
-    request: Request,
     medicine_id: str,
+    user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    user_id = getattr(request.state, "user_id", None)
-    result = await db.execute(select(Medicine).where(Medicine.id == medicine_id, Medicine.user_id == user_id))
+    result = await db.execute(_GET_MEDICINE, {"medicine_id": medicine_id, "user_id": user_id})
     medicine = result.scalar_one_or_none()
     if not medicine:
         raise HTTPException(status_code=404, detail="Medicine not found")
@@ -179,51 +243,43 @@ async def delete_medicine(
 
 @router.post("/{medicine_id}/status", response_model=MedicineIntakeRead)
 async def mark_medicine_status(
-    request: Request,
     medicine_id: str,
     payload: MedicineIntakeCreate,
+    user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Record when a user marks a medicine as taken/missed/delayed.
     """
-    # Ensure medicine exists for current user
-    user_id = getattr(request.state, "user_id", None)
+    # The ownership check and the write share one round trip;
+    # no row comes back when the medicine doesn't exist for this user
     result = await db.execute(
-        select(Medicine).where(Medicine.id == medicine_id, Medicine.user_id == user_id)
+        _MARK_STATUS,
+        {
+            "id": uuid7(),
+            "medicine_id": medicine_id,
+            "user_id": user_id,
+            "schedule_id": payload.schedule_id,
+            "status": payload.status,
+            "note": payload.note,
+        },
     )
-    medicine = result.scalar_one_or_none()
-    if not medicine:
+    intake = result.mappings().one_or_none()
+    if not intake:
         raise HTTPException(status_code=404, detail="Medicine not found")
 
-    intake = MedicineIntakeHistory(
-        user_id=user_id,
-        medicine_id=medicine.id,
-        schedule_id=payload.schedule_id,
-        status=payload.status,
-        note=payload.note,
-    )
-
-    db.add(intake)
     await db.commit()
-    await db.refresh(intake)
     return intake
 
 
 @router.get("/{medicine_id}/history", response_model=list[MedicineIntakeRead])
 async def get_medicine_history(
-    request: Request,
     medicine_id: str,
+    user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all intake history for a specific medicine.
     """
-    user_id = getattr(request.state, "user_id", None)
-    q = select(MedicineIntakeHistory).where(
-        MedicineIntakeHistory.medicine_id == medicine_id,
-        MedicineIntakeHistory.user_id == user_id,
-    ).order_by(MedicineIntakeHistory.taken_at.desc())
-
-    res = await db.execute(q)
-    return res.scalars().all()
+    result = await db.stream_scalars(_GET_INTAKE_HISTORY, {"medicine_id": medicine_id, "user_id": user_id})
+    return StreamingResponse(await _json_array(result, MedicineIntakeRead), media_type="application/json")
@@ -1,10 +1,16 @@
 # app/routes/auth.py
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from redis.asyncio import Redis
+from app.core.middleware import get_user_id
+from app.db.redis import get_redis
 from app.db.session import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.user_info_repo import UserInfoRepository
 from app.repositories.user_repo import UserRepository
 from app.schemas.user import UserInfoCreate, UserInfoResponse, UserResponse
+from app.services.profile_cache import get_profile, invalidate_profile, store_profile
 from app.services.user_service import UserInfoService
 
 
@@ -17,11 +23,16 @@ async def get_user_service(db: AsyncSession = Depends(get_db)) -> UserInfoServic
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(request: Request, db: AsyncSession = Depends(get_db)):
+async def get_me(
+    user_id: UUID = Depends(get_user_id),
+    db: AsyncSession = Depends(get_db),
+    redis: Optional[Redis] = Depends(get_redis),
+):
     """Return current user info using JWT token"""
-    user_id = getattr(request.state, "user_id", None)
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+    # Read-through cache (in-process, then Redis): a hit skips the users/users_info join entirely
+    cached = await get_profile(redis, user_id)
+    if cached:
+        return Response(content=cached, media_type="application/json")
 
     user_repo = UserRepository(db)
     user = await user_repo.get_user_with_info(user_id)
@@ -29,21 +40,19 @@ async def get_me(request: Request, db: AsyncSession = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    return user
+    body = UserResponse.model_validate(user, from_attributes=True).model_dump_json()
+    await store_profile(redis, user_id, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/{user_id}/create-profile", response_model=UserInfoResponse, status_code=status.HTTP_201_CREATED)
-async def create_profile(request: Request, user_info: UserInfoCreate,
-                         user_svc: UserInfoService = Depends(get_user_service)):
+async def create_profile(user_info: UserInfoCreate,
+                         user_id: UUID = Depends(get_user_id),
+                         user_svc: UserInfoService = Depends(get_user_service),
+                         redis: Optional[Redis] = Depends(get_redis)):
     """ 
     pass
     """
-    try:
-        user_id = getattr(request.state, "user_id", None)
-        user_info = await user_svc.get_or_create_user_info(user_id=user_id, user_info=user_info)
-        return user_info
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error creating/updating profile: {str(e)}"
-        )
+    user_info = await user_svc.get_or_create_user_info(user_id=user_id, user_info=user_info)
+    await invalidate_profile(redis, user_id)
+    return user_info
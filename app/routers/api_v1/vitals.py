@@ -1,18 +1,19 @@
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 import anyio
-from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
-from fastapi.responses import StreamingResponse
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import Response
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.middleware import get_user_id
 from app.db.session import get_db
 from app.models.vitals import UserVital
 from app.schemas.vitals import VitalCreate, VitalResponse, VitalUpdate
 from app.services.vitals_service import VitalService
-import pandas as pd
-import matplotlib.pyplot as plt
 from io import BytesIO
+from PIL import Image, ImageDraw, ImageFont
 
 router = APIRouter(prefix="/api/v1/vitals", tags=["Vitals"])
 
@@ -22,57 +23,45 @@ vital_service = VitalService()
 
 @router.post("/", response_model=VitalResponse, status_code=status.HTTP_201_CREATED)
 async def record_vitals(
-    request: Request,
     payload: VitalCreate,
+    user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Record user vitals — partial entries allowed (e.g. only BP or HR).
     """
-    user_id = getattr(request.state, "user_id", None)
-    if not any([payload.systolic_bp, payload.diastolic_bp, payload.heart_rate, payload.spo2, payload.weight]):
-        raise HTTPException(status_code=400, detail="At least one vital must be provided")
-
-    new_vital = UserVital(
-        user_id=user_id,
-        systolic_bp=payload.systolic_bp,
-        diastolic_bp=payload.diastolic_bp,
-        heart_rate=payload.heart_rate,
-        spo2=payload.spo2,
-        weight=payload.weight,
-        reading_time=payload.reading_time,
-    )
-
-    db.add(new_vital)
+    # id and recorded_at come back on the INSERT itself
+    result = await db.execute(insert(UserVital).values(user_id=user_id, **payload.model_dump()).returning(UserVital))
+    new_vital = result.scalar_one()
     await db.commit()
-    await db.refresh(new_vital)
     return new_vital
 
 
 @router.get("/me", response_model=list[VitalResponse])
 async def get_my_vitals(
-    request: Request,
-    db: AsyncSession = Depends(get_db)
+    user_id: UUID = Depends(get_user_id),
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(100, ge=1, le=1000, description="Max readings to return"),
+    before: Optional[datetime] = Query(None, description="Readings older than this (ISO); pass the last recorded_at"),
 ):
     """
-    Retrieve all vitals for the current user (for graph/trend view).
+    Retrieve the current user's vitals, newest first (for graph/trend view).
     """
-    user_id = getattr(request.state, "user_id", None)
-    result = await db.execute(
-        select(UserVital).where(UserVital.user_id == user_id).order_by(UserVital.recorded_at.desc())
-    )
+    q = select(UserVital).where(UserVital.user_id == user_id)
+    if before is not None:
+        q = q.where(UserVital.recorded_at < before)
+    result = await db.execute(q.order_by(UserVital.recorded_at.desc()).limit(limit))
     return result.scalars().all()
 
 
 @router.put("/{vital_id}", response_model=VitalResponse)
 async def update_vital(
-    request: Request,
     vital_id: UUID,
     payload: VitalUpdate,
+    user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    user_id = getattr(request.state, "user_id", None)
-    updated_vital = await vital_service.update_vital(db, user_id, vital_id, payload.dict(exclude_unset=True))
+    updated_vital = await vital_service.update_vital(db, user_id, vital_id, payload.model_dump(exclude_unset=True))
     if not updated_vital:
         raise HTTPException(status_code=404, detail="Vital not found or not authorized")
     return updated_vital
@@ -80,11 +69,10 @@ async def update_vital(
 
 @router.delete("/{vital_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_vital(
-    request: Request,
     vital_id: UUID,
+    user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db)
 ):
-    user_id = getattr(request.state, "user_id", None)
     deleted = await vital_service.delete_vital(db, user_id, vital_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Vital not found or not authorized")
@@ -108,51 +96,62 @@ async def _fetch_vitals(db: AsyncSession, user_id: str, start: Optional[datetime
 # -----------------------
 # Helper: Render vitals as table image
 # -----------------------
-def _render_table_image(df: pd.DataFrame, title: str = "Vitals Summary") -> bytes:
+VITALS_EXPORT_COLUMNS = (
+    "Recorded At", "Time of Day", "Systolic BP", "Diastolic BP", "Heart Rate", "SpO₂", "Weight",
+)
+CELL_PADDING = 8
+TABLE_MARGIN = 16
+
+
+@lru_cache
+def _table_fonts() -> tuple[ImageFont.FreeTypeFont, ImageFont.FreeTypeFont]:
+    """(cell font, title/header font), loaded once per process."""
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", 12), ImageFont.truetype("DejaVuSans-Bold.ttf", 14)
+    except OSError:
+        # Pillow's bundled font, for images without DejaVu installed
+        return ImageFont.load_default(size=12), ImageFont.load_default(size=14)
+
+
+def _render_table_image(rows: list[list[str]], title: str = "Vitals Summary") -> bytes:
     """
-    Render a Pandas DataFrame to a PNG table image.
+    Render rows of text cells to a PNG table image.
     """
-    display_df = df.copy()
-    if "recorded_at" in display_df.columns:
-        display_df["recorded_at"] = display_df["recorded_at"].dt.strftime("%Y-%m-%d %H:%M")
-
-    # Adjust figure size dynamically
-    rows, cols = display_df.shape
-    row_height = 0.5
-    col_width = 2.0
-    fig_height = max(2.5, row_height * (rows + 1))
-    fig_width = max(6, col_width * cols)
-
-    fig, ax = plt.subplots(figsize=(fig_width, fig_height))
-    ax.axis('off')
-    ax.set_title(title, fontsize=14, pad=12, fontweight="bold")
-
-    # Build table
-    table_data = display_df.fillna("").astype(str).values.tolist()
-    col_labels = list(display_df.columns)
-
-    table = ax.table(
-        cellText=table_data,
-        colLabels=col_labels,
-        loc='center',
-        cellLoc='center',
-        colLoc='center'
-    )
-
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-
-    for i in range(len(col_labels)):
-        table.auto_set_column_width(i)
-
-    plt.tight_layout()
-
-    # Save as bytes
+    font, bold = _table_fonts()
+    measure = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+    # Column width = widest cell (header included) plus padding on both sides
+    col_widths = [
+        int(max(measure.textlength(cell, font=font if r else bold) for r, cell in enumerate(column)))
+        + 2 * CELL_PADDING
+        for column in zip(VITALS_EXPORT_COLUMNS, *rows)
+    ]
+    row_height = bold.size + 2 * CELL_PADDING
+    title_height = bold.size + TABLE_MARGIN
+
+    width = sum(col_widths) + 2 * TABLE_MARGIN
+    height = TABLE_MARGIN + title_height + row_height * (len(rows) + 1) + TABLE_MARGIN
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    draw.text((width // 2, TABLE_MARGIN), title, font=bold, fill="black", anchor="mt")
+
+    y = TABLE_MARGIN + title_height
+    for r, row in enumerate([VITALS_EXPORT_COLUMNS, *rows]):
+        x = TABLE_MARGIN
+        for cell, col_width in zip(row, col_widths):
+            draw.rectangle(
+                (x, y, x + col_width, y + row_height), fill="#e6e6e6" if r == 0 else "white", outline="black"
+            )
+            draw.text(
+                (x + col_width // 2, y + row_height // 2), cell, font=bold if r == 0 else font, fill="black",
+                anchor="mm",
+            )
+            x += col_width
+        y += row_height
+
     buf = BytesIO()
-    plt.savefig(buf, format="png", bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return buf.read()
+    image.save(buf, format="PNG")
+    return buf.getvalue()
 
 
 # -----------------------
@@ -160,7 +159,7 @@ def _render_table_image(df: pd.DataFrame, title: str = "Vitals Summary") -> byte
 # -----------------------
 @router.get("/export", summary="Export vitals as PNG table")
 async def export_vitals_png(
-    request: Request,
+    user_id: UUID = Depends(get_user_id),
     db: AsyncSession = Depends(get_db),
     start: Optional[datetime] = Query(None, description="Start datetime (ISO)"),
     end: Optional[datetime] = Query(None, description="End datetime (ISO)"),
@@ -172,7 +171,6 @@ async def export_vitals_png(
     - `start` / `end`: ISO datetimes for filtering.
     - `max_rows`: limits results for safety.
     """
-    user_id = getattr(request.state, "user_id", None)
     vitals = await _fetch_vitals(db, user_id, start, end)
 
     if not vitals:
@@ -180,20 +178,16 @@ async def export_vitals_png(
 
     rows = []
     for v in vitals[:max_rows]:
-        rows.append({
-            "Recorded At": v.recorded_at,
-            "Time of Day": v.reading_time.value if getattr(v, "reading_time", None) else None,
-            "Systolic BP": v.systolic_bp,
-            "Diastolic BP": v.diastolic_bp,
-            "Heart Rate": v.heart_rate,
-            "SpO₂": v.spo2,
-            "Weight": v.weight,
-        })
-
-    df = pd.DataFrame(rows)
+        readings = (v.systolic_bp, v.diastolic_bp, v.heart_rate, v.spo2, v.weight)
+        rows.append([
+            v.recorded_at.strftime("%Y-%m-%d %H:%M"),
+            v.reading_time.value if v.reading_time else "",
+            *("" if value is None else str(value) for value in readings),
+        ])
 
     # Render in a thread (non-blocking)
-    png_bytes = await anyio.to_thread.run_sync(_render_table_image, df, f"{user_id}'s Vitals")
+    png_bytes = await anyio.to_thread.run_sync(_render_table_image, rows, f"{user_id}'s Vitals")
 
-    return StreamingResponse(BytesIO(png_bytes), media_type="image/png")
+    # Already fully rendered in memory, so send it as one body rather than streaming it
+    return Response(content=png_bytes, media_type="image/png")
 
@@ -1,77 +1,123 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+import logging
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import and_, delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.middleware import get_user_id
+from app.db.redis import get_redis
 from app.db.session import get_db
 from app.models.water import WaterGoal, WaterIntake
 from app.schemas.water import WaterGoalCreate, WaterIntakeCreate, WaterStatus
 from datetime import date
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/water", tags=["Water"])
 
+# Goals change rarely and set_water_goal refreshes the key, so the TTL is only a safety net
+GOAL_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _goal_cache_key(user_id: UUID) -> str:
+    return f"water:goal:{user_id}"
 
-# Helper to get today's intake
-async def get_today_intake(db: AsyncSession, user_id: str):
-    result = await db.execute(
-        select(WaterIntake).where(WaterIntake.user_id == user_id, WaterIntake.date == date.today())
-    )
-    intake = result.scalar_one_or_none()
-    return intake
+
+# The goal cache is optional: Redis errors are logged and the DB stays the source of truth
+async def _get_cached_goal(redis: Optional[Redis], user_id: UUID) -> Optional[str]:
+    if redis is None:
+        return None
+    try:
+        return await redis.get(_goal_cache_key(user_id))
+    except RedisError:
+        logger.warning("Water goal cache read failed for %s", user_id, exc_info=True)
+        return None
+
+
+async def _cache_goal(redis: Optional[Redis], user_id: UUID, goal_ml: int) -> None:
+    if redis is None:
+        return
+    try:
+        await redis.set(_goal_cache_key(user_id), goal_ml, ex=GOAL_CACHE_TTL_SECONDS)
+    except RedisError:
+        # If an older goal is still cached it is served until GOAL_CACHE_TTL_SECONDS runs out
+        logger.warning("Water goal cache write failed for %s", user_id, exc_info=True)
 
 
 # Set daily water goal
 @router.post("/goal")
-async def set_water_goal(request: Request, payload: WaterGoalCreate, db: AsyncSession = Depends(get_db)):
-    user_id = getattr(request.state, "user_id", None)
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-
-    goal = WaterGoal(user_id=user_id, goal_ml=payload.goal_ml)
-    db.add(goal)
+async def set_water_goal(
+    payload: WaterGoalCreate,
+    user_id: UUID = Depends(get_user_id),
+    db: AsyncSession = Depends(get_db),
+    redis: Optional[Redis] = Depends(get_redis),
+):
+    # Nothing is read back, so skip ORM object tracking
+    await db.execute(insert(WaterGoal).values(user_id=user_id, goal_ml=payload.goal_ml))
     await db.commit()
-    await db.refresh(goal)
-    return {"message": "Goal set", "goal_ml": goal.goal_ml}
+    await _cache_goal(redis, user_id, payload.goal_ml)
+    return {"message": "Goal set", "goal_ml": payload.goal_ml}
 
 
 # Log water intake
 @router.post("/intake")
-async def log_water_intake(request: Request, payload: WaterIntakeCreate, db: AsyncSession = Depends(get_db)):
-    user_id = getattr(request.state, "user_id", None)
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-
-    intake = await get_today_intake(db, user_id)
-    if intake:
-        intake.intake_ml += payload.intake_ml
-    else:
-        intake = WaterIntake(user_id=user_id, intake_ml=payload.intake_ml)
-        db.add(intake)
-
+async def log_water_intake(
+    payload: WaterIntakeCreate, user_id: UUID = Depends(get_user_id), db: AsyncSession = Depends(get_db)
+):
+    # Atomic add-or-create: concurrent logs for the same day can't lose updates
+    q = (
+        pg_insert(WaterIntake)
+        .values(user_id=user_id, intake_ml=payload.intake_ml, date=date.today())
+        .on_conflict_do_update(
+            index_elements=["user_id", "date"],
+            set_={"intake_ml": WaterIntake.intake_ml + payload.intake_ml},
+        )
+        .returning(WaterIntake.intake_ml)
+    )
+    result = await db.execute(q)
+    total_intake = result.scalar_one()
     await db.commit()
-    await db.refresh(intake)
-    return {"message": "Intake logged", "total_intake_ml": intake.intake_ml}
+    return {"message": "Intake logged", "total_intake_ml": total_intake}
 
 
 # Get progress/status
 @router.get("/status", response_model=WaterStatus)
-async def get_water_status(request: Request, db: AsyncSession = Depends(get_db)):
-    user_id = getattr(request.state, "user_id", None)
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-
-    # get latest goal
-    result = await db.execute(
-        select(WaterGoal).where(WaterGoal.user_id == user_id).order_by(WaterGoal.created_at.desc())
-    )
-    goal = result.scalar_one_or_none()
-    if not goal:
-        raise HTTPException(status_code=404, detail="Water goal not set")
-
-    intake = await get_today_intake(db, user_id)
-    total_intake = intake.intake_ml if intake else 0
-    remaining = max(goal.goal_ml - total_intake, 0)
+async def get_water_status(
+    user_id: UUID = Depends(get_user_id),
+    db: AsyncSession = Depends(get_db),
+    redis: Optional[Redis] = Depends(get_redis),
+):
+    cached_goal = await _get_cached_goal(redis, user_id)
+    if cached_goal is not None:
+        # Goal known: today's intake is a single index-only lookup
+        goal_ml = int(cached_goal)
+        result = await db.execute(
+            select(WaterIntake.intake_ml).where(WaterIntake.user_id == user_id, WaterIntake.date == date.today())
+        )
+        total_intake = result.scalar_one_or_none() or 0
+    else:
+        # Latest goal and today's intake in one round trip
+        result = await db.execute(
+            select(WaterGoal.goal_ml, WaterIntake.intake_ml)
+            .select_from(WaterGoal)
+            .outerjoin(WaterIntake, and_(WaterIntake.user_id == WaterGoal.user_id, WaterIntake.date == date.today()))
+            .where(WaterGoal.user_id == user_id)
+            .order_by(WaterGoal.created_at.desc(), WaterGoal.id.desc())
+            .limit(1)
+        )
+        row = result.one_or_none()
+        if not row:
+            raise HTTPException(status_code=404, detail="Water goal not set")
+
+        goal_ml, total_intake = row.goal_ml, row.intake_ml or 0
+        await _cache_goal(redis, user_id, goal_ml)
+    remaining = max(goal_ml - total_intake, 0)
 
     return WaterStatus(
-        goal_ml=goal.goal_ml,
+        goal_ml=goal_ml,
         total_intake_ml=total_intake,
         remaining_ml=remaining
     )
@@ -79,11 +125,7 @@ async def get_water_status(request: Request, db: AsyncSession = Depends(get_db))
 
 # Reset daily intake
 @router.post("/reset")
-async def reset_water_intake(request: Request, db: AsyncSession = Depends(get_db)):
-    user_id = getattr(request.state, "user_id", None)
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-
+async def reset_water_intake(user_id: UUID = Depends(get_user_id), db: AsyncSession = Depends(get_db)):
     await db.execute(
         delete(WaterIntake).where(WaterIntake.user_id == user_id, WaterIntake.date == date.today())
     )
@@ -1,9 +1,9 @@
 # app/schemas/medicine.py
 from datetime import date, time, datetime
-from typing import Optional, List
+from typing import Any, Optional, List
 from uuid import UUID
-from pydantic import BaseModel, Field
-from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field
+from app.models.medicine import IntakeStatus
 
 
 class MedicineScheduleBase(BaseModel):
@@ -19,8 +19,7 @@ class MedicineScheduleCreate(MedicineScheduleBase):
 class MedicineScheduleRead(MedicineScheduleBase):
     id: UUID
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MedicineBase(BaseModel):
@@ -48,40 +47,31 @@ class MedicineRead(MedicineBase):
     id: UUID
     schedules: List[MedicineScheduleRead] = []
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MedicineHistoryRead(BaseModel):
     change_type: str
-    old_value: Optional[str]
-    new_value: Optional[str]
+    old_value: Optional[Any]
+    new_value: Optional[Any]
     changed_at: datetime
 
-    class Config:
-        orm_mode = True
-
-
-class IntakeStatus(str, Enum):
-    taken = "taken"
-    missed = "missed"
-    delayed = "delayed"
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MedicineIntakeCreate(BaseModel):
     status: IntakeStatus = Field(..., description="Intake status: taken/missed/delayed")
-    schedule_id: Optional[str] = Field(None, description="Optional schedule reference (e.g., morning dose)")
+    schedule_id: Optional[UUID] = Field(None, description="Optional schedule reference (e.g., morning dose)")
     note: Optional[str] = Field(None, description="Optional note (e.g. 'Felt dizzy after')")
 
 
 class MedicineIntakeRead(BaseModel):
     id: UUID
-    medicine_id: str
-    schedule_id: Optional[str]
+    medicine_id: UUID
+    schedule_id: Optional[UUID]
     status: IntakeStatus
     note: Optional[str]
     taken_at: datetime
     recorded_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
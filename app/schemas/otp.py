@@ -1,13 +1,15 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 
+from app.core.utils.contact_utils import MAX_CONTACT_LENGTH
+
 
 class RequestOTPIn(BaseModel):
-    contact: str  # can be email or phone
+    contact: str = Field(..., max_length=MAX_CONTACT_LENGTH)  # can be email or phone
 
 
 class VerifyOTPIn(BaseModel):
-    contact: str
+    contact: str = Field(..., max_length=MAX_CONTACT_LENGTH)
     otp: str
     device_info: Optional[str] = None
 
@@ -18,4 +20,4 @@ class OTPResponse(BaseModel):
 
 class ResendOtpRequest(BaseModel):
     email: Optional[EmailStr] = None
-    phone_number: Optional[str] = None
+    phone_number: Optional[str] = Field(None, max_length=MAX_CONTACT_LENGTH)
@@ -1,5 +1,5 @@
 from uuid import UUID
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional
 
 
@@ -46,15 +46,13 @@ class UserInfoResponse(UserInfoBase):
     id: UUID
     user_id: UUID
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserRead(UserBase):
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserUpdate(BaseModel):
@@ -67,5 +65,4 @@ class UserResponse(BaseModel):
     phone_number: Optional[str]
     info: Optional[UserInfoBase]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
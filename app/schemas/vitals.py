@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import Annotated, Optional
 from uuid import UUID
 from datetime import datetime
@@ -29,14 +29,22 @@ class VitalBase(BaseModel):
 class VitalCreate(VitalBase):
     reading_time: ReadingTime = Field(..., description="Time of the day when vitals were recorded")
 
+    @model_validator(mode="after")
+    def require_one_vital(self):
+        """Partial entries are fine, but an entry with no readings at all is rejected."""
+        if not (self.systolic_bp or self.diastolic_bp or self.heart_rate or self.spo2 or self.weight):
+            raise ValueError("At least one vital must be provided")
+        return self
+
 
 class VitalUpdate(VitalBase):
     reading_time: Optional[ReadingTime] = None
 
 
-class VitalResponse(VitalCreate):
+# Not derived from VitalCreate: stored rows are serialized as-is, without the create-time check
+class VitalResponse(VitalBase):
+    reading_time: ReadingTime
     id: UUID
     recorded_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
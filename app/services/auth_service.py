@@ -1,24 +1,38 @@
 # app/services/auth_service.py
-from passlib.context import CryptContext
-from jose import jwt
-from datetime import datetime, timedelta
+import time
+from functools import lru_cache
+import bcrypt
+import jwt
+from datetime import datetime, timedelta, timezone
 from app.core.config import settings
 from app.repositories.user_repo import UserRepository
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Logins for the same user within one bucket reuse the already-signed token
+TOKEN_BUCKET_SECONDS = 15
+# Encoded once so PyJWT doesn't re-encode the key on every signature
+_SECRET = settings.SECRET_KEY.encode("utf-8")
+
+
+@lru_cache(maxsize=4096)
+def _signed_access_token(subject: str, bucket: int) -> str:
+    expire = bucket * TOKEN_BUCKET_SECONDS + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    return jwt.encode({"exp": expire, "sub": subject}, _SECRET, algorithm="HS256")
 
 
 class AuthService:
     def __init__(self, user_repo: UserRepository):
         self.user_repo = user_repo
 
+    # bcrypt is deliberately slow (~100ms); call these via anyio.to_thread from async code
     def verify_password(self, plain, hashed):
-        return pwd_context.verify(plain, hashed)
+        return bcrypt.checkpw(plain.encode(), hashed.encode())
 
     def hash_password(self, pw: str) -> str:
-        return pwd_context.hash(pw)
+        return bcrypt.hashpw(pw.encode(), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode()
 
     def create_access_token(self, subject: str, expires_delta: timedelta = None):
-        expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+        if expires_delta is None:
+            return _signed_access_token(str(subject), int(time.time()) // TOKEN_BUCKET_SECONDS)
+        expire = datetime.now(timezone.utc) + expires_delta
         to_encode = {"exp": expire, "sub": str(subject)}
-        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
+        return jwt.encode(to_encode, _SECRET, algorithm="HS256")
@@ -1,119 +1,133 @@
 # app/services/otp_service.py
-import secrets
-import string
+import asyncio
+import base64
+import hashlib
+import hmac
+import struct
 import time
+import unicodedata
+from functools import lru_cache
 import pyotp
 from typing import Optional
 
-from app.core.config import settings
+from app.db.redis import redis_client as shared_redis_client
+from app.core.utils.contact_utils import classify_contact
 from app.services.senders.email_sender import EmailSender  # new/updated sender below
 from app.services.senders.phone_sender import PhoneSender
 from redis.asyncio import Redis  # uses redis-py v4+ asyncio support
+from redis.exceptions import RedisError
 
 OTP_LENGTH = 6
 OTP_EXPIRES_SECONDS = 18000  # 5 minutes
-OTP_PREFIX = "heartcoach:otp:"
+OTP_THROTTLE_SECONDS = 30  # min gap between sends to one contact
 
+# Only the code varies per send
+_BODY_NEW = f"Your OTP is {{otp}}. It will expire in {OTP_EXPIRES_SECONDS // 60} minutes."
+_BODY_RESEND = f"Your OTP has been resend {{otp}}. It will expire in {OTP_EXPIRES_SECONDS // 60} minutes."
 
-class OTPService:
-    def __init__(self, redis_client: Optional[Redis] = None):
-        # Prefer an injected redis client; create if settings present
-        if redis_client is not None:
-            self.redis = redis_client
-        else:
-            if settings.REDIS_URL:
-                self.redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
-            else:
-                self.redis = None  # use fallback store below
 
-        # Sender abstraction (email; later add sms/whatsapp)
-        self.email_sender = EmailSender()
-        self.phone_sender = PhoneSender()
+class OTPThrottled(Exception):
+    """An OTP was already sent to this contact within OTP_THROTTLE_SECONDS."""
 
-        # In-memory fallback (not across processes!)
-        self._mem_store = {}
 
-    def _otp_key(self, contact: str) -> str:
-        return f"{OTP_PREFIX}{contact}"
+@lru_cache(maxsize=1024)
+def _secret_bytes(secret: str) -> bytes:
+    # Secrets live for the whole OTP window, so resend/verify reuse the key decoded at generation
+    return base64.b32decode(secret + "=" * (-len(secret) % 8), casefold=True)
 
-    async def generate_otp(self, contact: str):
-        # Create a unique secret per contact
-        secret = pyotp.random_base32()
-        totp = pyotp.TOTP(secret, interval=settings.OTP_VALIDITY_MINUTES * 60)
-        otp = totp.now()
 
-        # Store secret in Redis for later verification
-        await self.redis.setex(f"otp_secret:{contact}", settings.OTP_VALIDITY_MINUTES * 60, secret)
+def _totp(secret: str, interval: int) -> str:
+    """RFC 6238 code for the current window; same output as pyotp.TOTP(secret, interval=interval).now()."""
+    counter = int(time.time()) // interval
+    digest = hmac.new(_secret_bytes(secret), struct.pack(">Q", counter), hashlib.sha1).digest()
+    offset = digest[-1] & 0x0F
+    code = int.from_bytes(digest[offset:offset + 4], "big") & 0x7FFFFFFF
+    return f"{code % 10 ** OTP_LENGTH:0{OTP_LENGTH}d}"
 
-        return otp
 
-    async def store_otp(self, contact: str, otp: str) -> None:
-        key = self._otp_key(contact)
-        if self.redis:
-            await self.redis.set(key, otp, ex=OTP_EXPIRES_SECONDS)
-        else:
-            # Fallback: store in-memory with expiry timestamp
-            self._mem_store[contact] = (otp, time.time() + OTP_EXPIRES_SECONDS)
+class OTPService:
+    def __init__(self, redis_client: Optional[Redis] = None):
+        # Prefer an injected redis client; otherwise the process-wide pooled one. OTP secrets and throttling
+        # live only in Redis, so REDIS_URL must be set. It must be built with decode_responses=True: secrets
+        # are read back as str.
+        self.redis = redis_client if redis_client is not None else shared_redis_client
 
-    async def get_otp(self, contact: str) -> Optional[str]:
-        key = self._otp_key(contact)
-        if self.redis:
-            return await self.redis.get(key)
-        else:
-            data = self._mem_store.get(contact)
-            if not data:
-                return None
-            otp, expires_at = data
-            if time.time() > expires_at:
-                self._mem_store.pop(contact, None)
-                return None
-            return otp
-
-    async def delete_otp(self, contact: str) -> None:
-        key = self._otp_key(contact)
-        if self.redis:
-            await self.redis.delete(key)
-        else:
-            self._mem_store.pop(contact, None)
+        # Sender abstraction (email; later add sms/whatsapp)
+        self.email_sender = EmailSender()
+        self.phone_sender = PhoneSender()
 
-    async def _generate_secret_and_otp(self, contact: str):
-        """Generate new secret and OTP for a contact."""
-        secret = pyotp.random_base32()
-        totp = pyotp.TOTP(secret, interval=OTP_EXPIRES_SECONDS)
-        otp = totp.now()
-        await self.redis.setex(f"otp_secret:{contact}", OTP_EXPIRES_SECONDS, secret)
-        return otp
+    @staticmethod
+    def _throttle_key(contact: str) -> str:
+        return f"otp_throttle:{contact}"
+
+    async def _release_throttle(self, *keys: str) -> None:
+        """Best-effort delete of throttle (and any extra) keys after a send that delivered nothing."""
+        try:
+            await self.redis.delete(*keys)
+        except RedisError:
+            pass
 
     async def generate_and_send(self, contact: str) -> bool:
-        """Generate new OTP and send."""
-        otp = await self._generate_secret_and_otp(contact)
-        return await self._send(contact, otp)
+        """Generate new OTP and send. Raises OTPThrottled if one went out to this contact recently."""
+        # Checked before any secret/TOTP/send work; NX makes check-and-claim a single command
+        if not await self.redis.set(self._throttle_key(contact), "1", ex=OTP_THROTTLE_SECONDS, nx=True):
+            raise OTPThrottled(contact)
+        secret = pyotp.random_base32()
+        otp = _totp(secret, OTP_EXPIRES_SECONDS)
+
+        # Storing the secret and sending the code are independent once the code exists, so overlap them
+        key = f"otp_secret:{contact}"
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self.redis.setex(key, OTP_EXPIRES_SECONDS, secret))
+                sent = tg.create_task(self._send(contact, otp))
+        except* RedisError as eg:
+            # The send may already have gone out with a code that can never verify. Release the throttle so
+            # the user can ask again right away, and drop whatever secret is left for this contact.
+            await self._release_throttle(self._throttle_key(contact), key)
+            raise eg.exceptions[0]
+        except* Exception as eg:
+            # Sender blew up: no code was delivered, so don't hold the user to the throttle window
+            await self._release_throttle(self._throttle_key(contact))
+            raise eg.exceptions[0]
+        if not sent.result():
+            await self._release_throttle(self._throttle_key(contact))
+            return False
+        return True
 
     async def fetch_and_send(self, contact: str) -> bool:
         """
         Fetch existing OTP if still valid, else generate a new one, then send it.
+        Raises OTPThrottled if one went out to this contact recently.
         """
-        secret = await self.redis.get(f"otp_secret:{contact}")
-        if secret:
-            if isinstance(secret, bytes):
-                secret = secret.decode()
-            # Existing valid secret → regenerate same OTP
-            totp = pyotp.TOTP(secret, interval=OTP_EXPIRES_SECONDS)
-            otp = totp.now()
-        else:
-            # No secret → generate new one
-            otp = await self._generate_secret_and_otp(contact)
-
-        # Send the same (or new) OTP
-        return await self._send(contact, otp, True)
+        key = f"otp_secret:{contact}"
+        # One round-trip: claim the throttle slot, store a fresh secret only if none is live (NX),
+        # then read back whichever secret won. Neither SET NX can clobber an existing value.
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._throttle_key(contact), "1", ex=OTP_THROTTLE_SECONDS, nx=True)
+            pipe.set(key, pyotp.random_base32(), ex=OTP_EXPIRES_SECONDS, nx=True)
+            pipe.get(key)
+            allowed, _, secret = await pipe.execute()
+        if not allowed:
+            raise OTPThrottled(contact)
+
+        # Existing valid secret → same OTP; otherwise the one just stored
+        otp = _totp(secret, OTP_EXPIRES_SECONDS)
+
+        # Send the same (or new) OTP; the secret stays for a retry, only the throttle is released on failure
+        try:
+            sent = await self._send(contact, otp, True)
+        except Exception:
+            await self._release_throttle(self._throttle_key(contact))
+            raise
+        if not sent:
+            await self._release_throttle(self._throttle_key(contact))
+        return sent
 
     async def _send(self, contact: str, otp: str, resend: bool = False) -> bool:
         """Send OTP via appropriate channel."""
-        if resend:
-            body = f"Your OTP has been resend {otp}. It will expire in {OTP_EXPIRES_SECONDS // 60} minutes."
-        else:
-            body = f"Your OTP is {otp}. It will expire in {OTP_EXPIRES_SECONDS // 60} minutes."
-        if "@" in contact:
+        body = (_BODY_RESEND if resend else _BODY_NEW).replace("{otp}", otp)
+        if classify_contact(contact) == "email":
             subject = "Your HeartCoach Verification Code"
             return await self.email_sender.send_email(to_email=contact, subject=subject, body=body)
         else:
@@ -127,8 +141,6 @@ class OTPService:
         if not secret:
             return False
 
-        if isinstance(secret, bytes):
-            secret = secret.decode()
-
-        totp = pyotp.TOTP(secret, interval=OTP_EXPIRES_SECONDS)
-        return totp.verify(otp)
+        # Compare bytes: compare_digest rejects non-ASCII str, and NFKC maps e.g. fullwidth digits like pyotp did
+        submitted = unicodedata.normalize("NFKC", str(otp)).encode()
+        return hmac.compare_digest(submitted, _totp(secret, OTP_EXPIRES_SECONDS).encode())
@@ -0,0 +1,58 @@
+# app/services/profile_cache.py
+import logging
+from typing import Optional
+from uuid import UUID
+
+from cachetools import TTLCache
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Writes invalidate explicitly, so the TTL is only a backstop
+PROFILE_CACHE_TTL_SECONDS = 300
+# In-process layer in front of Redis; short TTL bounds staleness across workers
+LOCAL_CACHE_SIZE = 10_000
+LOCAL_CACHE_TTL_SECONDS = 30
+
+# Serialized /user/me bodies. Only touched from the event loop, so no lock needed.
+_local: TTLCache[UUID, str] = TTLCache(maxsize=LOCAL_CACHE_SIZE, ttl=LOCAL_CACHE_TTL_SECONDS)
+
+
+def _key(user_id: UUID) -> str:
+    return f"user:{user_id}:profile"
+
+
+# The cache fails open: a Redis error is logged and treated as a miss, so callers fall through to the DB
+
+
+async def get_profile(redis: Optional[Redis], user_id: UUID) -> Optional[str]:
+    body = _local.get(user_id)
+    if body is None and redis is not None:
+        try:
+            body = await redis.get(_key(user_id))
+        except RedisError:
+            logger.warning("Profile cache read failed for %s", user_id, exc_info=True)
+            return None
+        if body:
+            _local[user_id] = body
+    return body
+
+
+async def store_profile(redis: Optional[Redis], user_id: UUID, body: str) -> None:
+    _local[user_id] = body
+    if redis is not None:
+        try:
+            await redis.set(_key(user_id), body, ex=PROFILE_CACHE_TTL_SECONDS)
+        except RedisError:
+            logger.warning("Profile cache write failed for %s", user_id, exc_info=True)
+
+
+async def invalidate_profile(redis: Optional[Redis], user_id: UUID) -> None:
+    _local.pop(user_id, None)
+    if redis is not None:
+        try:
+            await redis.delete(_key(user_id))
+        except RedisError:
+            # Other workers may serve the old body until PROFILE_CACHE_TTL_SECONDS runs out
+            logger.warning("Profile cache invalidation failed for %s", user_id, exc_info=True)
@@ -1,8 +1,27 @@
 # app/services/senders/email_sender.py
-import anyio
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 from app.core.config import settings
 from app.core.utils.email_utils import send_email as sync_send_email
 
+logger = logging.getLogger(__name__)
+
+SENDGRID_API_URL = "https://api.sendgrid.com/v3"
+
+# Shared by every EmailSender so sends reuse warm keep-alive connections; closed on app shutdown
+sendgrid_client = httpx.AsyncClient(
+    base_url=SENDGRID_API_URL,
+    headers={"Authorization": f"Bearer {settings.EMAIL_PASSWORD}"},
+    timeout=10,
+    limits=httpx.Limits(max_keepalive_connections=32),
+)
+
+# Own thread for the blocking SMTP helper, so MailHog sends never queue behind (or hold) anyio's shared
+# worker threads. One worker: the helper serializes on its single cached SMTP connection anyway.
+smtp_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp")
+
 
 class EmailSender:
     def __init__(self, from_email: str | None = None):
@@ -10,14 +29,29 @@ class EmailSender:
 
     async def send_email(self, to_email: str, subject: str, body: str, html: bool = False) -> bool:
         """
-        Wraps the existing sync `send_email` helper into a non-blocking call.
-        Replace this implementation with an async SendGrid client later for better performance.
+        Send through the SendGrid v3 REST API on the event loop (no worker thread).
+        MailHog only speaks SMTP, so local dev still goes through the sync helper on the SMTP thread.
         """
-        # call sync function in threadpool to avoid blocking the event loop
+        if settings.EMAIL_PROVIDER == "mailhog":
+            try:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(smtp_pool, sync_send_email, to_email, subject, body, html)
+                return bool(result)
+            except Exception:
+                logger.exception("SMTP email send to %s failed", to_email)
+                return False
+
+        payload = {
+            "personalizations": [{"to": [{"email": to_email}]}],
+            "from": {"email": self.from_email},
+            "subject": subject,
+            "content": [{"type": "text/html" if html else "text/plain", "value": body}],
+        }
         try:
-            result = await anyio.to_thread.run_sync(sync_send_email, to_email, subject, body, html)
-            return bool(result)
-        except Exception as e:
-            # you can also emit structured logs here
-            print("Error sending email (async wrapper):", e)
+            response = await sendgrid_client.post("/mail/send", json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            logger.exception("SendGrid email send to %s failed", to_email)
             return False
+        logger.info("Email sent to %s, status %s", to_email, response.status_code)
+        return True
@@ -1,7 +1,19 @@
-# app/services/senders/email_sender.py
-import anyio
+# app/services/senders/phone_sender.py
+import logging
+import httpx
 from app.core.config import settings
-from app.core.utils.phone_utils import send_phone as sync_send_phopne
+
+logger = logging.getLogger(__name__)
+
+TWILIO_API_URL = "https://api.twilio.com/2010-04-01"
+
+# Shared by every PhoneSender so sends reuse warm keep-alive connections; closed on app shutdown
+twilio_client = httpx.AsyncClient(
+    base_url=TWILIO_API_URL,
+    auth=(settings.TWILIO_ACCOUNT_SID or "", settings.TWILIO_AUTH_TOKEN or ""),
+    timeout=10,
+    limits=httpx.Limits(max_keepalive_connections=32),
+)
 
 
 class PhoneSender:
@@ -10,14 +22,16 @@ class PhoneSender:
 
     async def send_phone(self, to_phone: str, body: str) -> bool:
         """
-        Wraps the existing sync `send_email` helper into a non-blocking call.
-        Replace this implementation with an async SendGrid client later for better performance.
+        Send an SMS through the Twilio Messages REST API on the event loop (no worker thread).
         """
-        # call sync function in threadpool to avoid blocking the event loop
         try:
-            result = await anyio.to_thread.run_sync(sync_send_phopne, to_phone, body)
-            return bool(result)
-        except Exception as e:
-            # you can also emit structured logs here
-            print("Error sending email (async wrapper):", e)
+            response = await twilio_client.post(
+                f"/Accounts/{settings.TWILIO_ACCOUNT_SID}/Messages.json",
+                data={"From": self.from_phone, "To": to_phone, "Body": body},
+            )
+            response.raise_for_status()
+        except httpx.HTTPError:
+            logger.exception("Twilio SMS send to %s failed", to_phone)
             return False
+        logger.info("SMS sent to %s", to_phone)
+        return True